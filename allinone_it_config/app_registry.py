@@ -26,6 +26,7 @@ class AppEntry:
     local_alt_names: Tuple[str, ...] = ()
     source: str | None = None
     installer_path: str | None = None
+    verbose_output: bool = False
 
 
 @dataclass(frozen=True)
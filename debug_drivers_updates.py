@@ -4,14 +4,76 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import itertools
 import json
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
 from typing import Any, Iterable
 
+try:  # orjson is optional; fall back to stdlib json when absent
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+if orjson is not None:
+
+    def _json_loads(data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    def _json_dump_row(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+else:
+
+    def _json_loads(data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+    def _json_dump_row(obj: Any) -> str:
+        return json.dumps(obj)
+
+
+# One alternation so each leaf string is scanned a single time.
+_ALL_PNP_RE = re.compile(
+    r"PCI\\VEN_[0-9A-F]{4}&DEV_[0-9A-F]{4}[^\s;]*"
+    r"|USB\\VID_[0-9A-F]{4}&PID_[0-9A-F]{4}[^\s;]*"
+    r"|HDAUDIO\\FUNC_[0-9A-F]{2}[^\s;]*",
+    re.IGNORECASE,
+)
+_INF_RE = re.compile(r"([a-z0-9_\-]+\.inf)\b")
+_NONALNUM_RE = re.compile(r"[^a-z0-9]+")
+_DRIVER_TEXT_RE = re.compile(r"\bbios\b|\bfirmware\b")
+_VERSION_RE = re.compile(r"(\d+(?:\.\d+){0,4})")
+
+# Literal alternations: plain substring tests beat the regex engine here.
+_GRAPHICS_WORDS = ("graphics", "display", "video")
+_AUDIO_WORDS = ("audio", "sound", "realtek")
+_NET_WORDS = ("network", "ethernet", "wireless", "wifi", "bluetooth")
+_CHIPSET_WORDS = ("chipset", "serial", "management", "usb")
+_STORAGE_WORDS = ("storage", "rapid", "rst", "raid", "optane")
+_NET_CLASS_WORDS = ("wireless", "wlan", "wifi", "ethernet", "network", "bluetooth")
+_STORAGE_CLASS_WORDS = ("storage", "raid", "rst", "rapid", "ssd", "nvme")
+_CHIPSET_CLASS_WORDS = ("chipset", "serial", "management engine", "me driver", "platform")
+_BIOS_WORDS = ("bios", "firmware")
+
+# Word-boundary checks on normalized strings become set lookups over tokens.
+_WLAN_TOKENS = frozenset({"wlan", "wifi", "wireless"})
+_FIRMWARE_TOKENS = frozenset({"firmware", "bios"})
+
+
+def _contains_any(text: str, words: tuple[str, ...]) -> bool:
+    return any(word in text for word in words)
+
 
 def _run_powershell(script: str) -> str:
     if not shutil.which("powershell"):
@@ -28,14 +90,6 @@ def _run_powershell(script: str) -> str:
     return result.stdout
 
 
-def _as_list(value: Any) -> list[Any]:
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return value
-    return [value]
-
-
 def _find_hpia_exe() -> str | None:
     candidates = [
         r"C:\Program Files\HP\HPIA\HPImageAssistant.exe",
@@ -65,12 +119,19 @@ def _run_hpia_report(hpia_path: str, report_dir: str) -> str:
 
 def _load_hpia_report(report_path: str) -> list[dict[str, Any]]:
     if os.path.isdir(report_path):
-        candidates = [os.path.join(report_path, name) for name in os.listdir(report_path) if name.lower().endswith(".json")]
-        if not candidates:
+        newest = None
+        newest_mtime = -1.0
+        with os.scandir(report_path) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(".json"):
+                    mtime = entry.stat().st_mtime
+                    if mtime > newest_mtime:
+                        newest, newest_mtime = entry.path, mtime
+        if newest is None:
             return []
-        report_path = max(candidates, key=os.path.getmtime)
-    with open(report_path, "r", encoding="utf-8") as handle:
-        data = json.load(handle)
+        report_path = newest
+    with open(report_path, "rb") as handle:
+        data = _json_loads(handle.read())
     if isinstance(data, dict):
         data = data.get("HPIA", {}).get("Recommendations") or data.get("Recommendations") or data
     if isinstance(data, dict):
@@ -78,46 +139,51 @@ def _load_hpia_report(report_path: str) -> list[dict[str, Any]]:
     return [item for item in (data or []) if isinstance(item, dict)]
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_name(value: str) -> str:
     text = value.lower()
     text = text.replace("wi-fi", "wifi").replace("wi fi", "wifi")
-    text = re.sub(r"[^a-z0-9]+", " ", text)
+    text = _NONALNUM_RE.sub(" ", text)
     return text.strip()
 
 
+@functools.lru_cache(maxsize=4096)
+def _tokenize_name(value: str) -> tuple[str, frozenset[str]]:
+    """Normalized string plus its word-token set, for O(1) word tests."""
+    normalized = _normalize_name(value)
+    return normalized, frozenset(normalized.split())
+
+
 def _extract_pnp_ids(value: Any) -> set[str]:
     ids: set[str] = set()
-    items = _as_list(value)
-    for item in items:
+    stack = [value]
+    while stack:
+        item = stack.pop()
         if not item:
             continue
-        if isinstance(item, dict):
-            for v in item.values():
-                ids.update(_extract_pnp_ids(v))
-            continue
-        text = str(item)
-        for match in re.findall(r"(PCI\\VEN_[0-9A-F]{4}&DEV_[0-9A-F]{4}[^\\s;]*)", text, re.IGNORECASE):
-            ids.add(match.upper())
-        for match in re.findall(r"(USB\\VID_[0-9A-F]{4}&PID_[0-9A-F]{4}[^\\s;]*)", text, re.IGNORECASE):
-            ids.add(match.upper())
-        for match in re.findall(r"(HDAUDIO\\FUNC_[0-9A-F]{2}[^\\s;]*)", text, re.IGNORECASE):
-            ids.add(match.upper())
+        if isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        else:
+            for match in _ALL_PNP_RE.findall(str(item)):
+                ids.add(match.upper())
     return ids
 
 
 def _extract_inf_names(value: Any) -> set[str]:
     infs: set[str] = set()
-    items = _as_list(value)
-    for item in items:
+    stack = [value]
+    while stack:
+        item = stack.pop()
         if not item:
             continue
-        if isinstance(item, dict):
-            for v in item.values():
-                infs.update(_extract_inf_names(v))
-            continue
-        text = str(item).lower()
-        for match in re.findall(r"([a-z0-9_\-]+\.inf)\b", text):
-            infs.add(match)
+        if isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        else:
+            infs.update(_INF_RE.findall(str(item).lower()))
     return infs
 
 
@@ -133,106 +199,192 @@ def _get_field(item: dict[str, Any], *names: str) -> Any:
     return None
 
 
-def _build_search_terms(driver_name: str) -> list[str]:
+def _flatten_cmsl_item(item: dict[str, Any]) -> dict[str, Any]:
+    """Resolve every field the matching loop needs with a single pass.
+
+    Stored under item["_flat"] so the hot path does one dict get instead of
+    repeated _get_field fallback chains per pair.
+    """
+    flat = item.get("_flat")
+    if flat is None:
+        flat = {
+            "name": str(_get_field(item, "Name", "DeviceName") or ""),
+            "category": str(_get_field(item, "Category", "Class", "ClassName") or ""),
+            "version": _get_field(item, "Version"),
+            "id": _get_field(item, "Id", "SoftPaqId", "Number"),
+            "pnp": frozenset(
+                _extract_pnp_ids(
+                    _get_field(item, "HardwareID", "HardwareIds", "HWID", "DeviceID", "DeviceIds", "PnPIds", "SupportedDevices", "Devices")
+                )
+            ),
+            "inf": frozenset(
+                _extract_inf_names(_get_field(item, "InfName", "INF", "Inf", "InfFiles", "CVA", "Description", "Notes"))
+            ),
+        }
+        item["_flat"] = flat
+    return flat
+
+
+def _flatten_installed_item(inst: dict[str, Any]) -> dict[str, Any]:
+    flat = inst.get("_flat")
+    if flat is None:
+        flat = {
+            "name": str(_get_field(inst, "DeviceName", "Name") or ""),
+            "class": str(_get_field(inst, "Class") or "").lower(),
+            "version": _get_field(inst, "DriverVersion"),
+            "config_code": _get_field(inst, "ConfigManagerErrorCode"),
+        }
+        inst["_flat"] = flat
+    return flat
+
+
+# Plain substring rules: needle in name -> terms to add.
+_TERM_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("intel", ("intel",)),
+    ("realtek", ("realtek",)),
+    ("nvidia", ("nvidia",)),
+    ("amd", ("amd",)),
+    ("bluetooth", ("bluetooth",)),
+    ("chipset", ("chipset",)),
+    ("bios", ("bios",)),
+    ("firmware", ("firmware",)),
+    ("thunderbolt", ("thunderbolt",)),
+    ("usb 3", ("usb 3",)),
+)
+
+# Single alternation covering every keyword group; one findall pass replaces
+# the old cascade of per-group re.search calls.
+_KEYWORD_RE = re.compile(
+    r"wireless|wlan|wifi|wi-fi|graphics|video|display|audio|sound|ethernet|nic|network"
+    r"|storage|raid|rst|rapid|management engine|me driver|serial io|serialio|arc|a380|a770"
+)
+
+_KEYWORD_TERMS: dict[str, tuple[str, ...]] = {
+    "wireless": ("wireless", "wlan", "wifi"),
+    "wlan": ("wireless", "wlan", "wifi"),
+    "wifi": ("wireless", "wlan", "wifi"),
+    "wi-fi": ("wireless", "wlan", "wifi"),
+    "graphics": ("graphics", "video", "display"),
+    "video": ("graphics", "video", "display"),
+    "display": ("graphics", "video", "display"),
+    "audio": ("audio", "sound"),
+    "sound": ("audio", "sound"),
+    "ethernet": ("ethernet", "network"),
+    "nic": ("ethernet", "network"),
+    "network": ("ethernet", "network"),
+    "storage": ("storage", "rapid", "rst"),
+    "raid": ("storage", "rapid", "rst"),
+    "rst": ("storage", "rapid", "rst"),
+    "rapid": ("storage", "rapid", "rst"),
+    "management engine": ("management engine",),
+    "me driver": ("management engine",),
+    "serial io": ("serial",),
+    "serialio": ("serial",),
+    "arc": ("arc",),
+    "a380": ("arc",),
+    "a770": ("arc",),
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_search_terms(driver_name: str) -> tuple[str, ...]:
     driver_lower = driver_name.lower()
-    terms: list[str] = []
-    if "intel" in driver_lower:
-        terms.append("intel")
-    if "realtek" in driver_lower:
-        terms.append("realtek")
-    if "nvidia" in driver_lower:
-        terms.append("nvidia")
-    if "amd" in driver_lower:
-        terms.append("amd")
-    if "bluetooth" in driver_lower:
-        terms.append("bluetooth")
-    if re.search(r"wireless|wlan|wifi|wi-fi", driver_lower):
-        terms.extend(["wireless", "wlan", "wifi"])
-    if re.search(r"graphics|video|display", driver_lower):
-        terms.extend(["graphics", "video", "display"])
-    if re.search(r"audio|sound", driver_lower):
-        terms.extend(["audio", "sound"])
-    if re.search(r"ethernet|nic|network", driver_lower):
-        terms.extend(["ethernet", "network"])
-    if "chipset" in driver_lower:
-        terms.append("chipset")
-    if re.search(r"storage|raid|rst|rapid", driver_lower):
-        terms.extend(["storage", "rapid", "rst"])
-    if "bios" in driver_lower:
-        terms.append("bios")
-    if "firmware" in driver_lower:
-        terms.append("firmware")
-    if re.search(r"management engine|me driver", driver_lower):
-        terms.append("management engine")
-    if "thunderbolt" in driver_lower:
-        terms.append("thunderbolt")
-    if re.search(r"serial io|serialio", driver_lower):
-        terms.append("serial")
-    if re.search(r"arc|a380|a770", driver_lower):
-        terms.append("arc")
-    if "usb 3" in driver_lower:
-        terms.append("usb 3")
-    return terms
+    terms: dict[str, None] = {}
+    for needle, mapped in _TERM_RULES:
+        if needle in driver_lower:
+            for term in mapped:
+                terms[term] = None
+    for hit in _KEYWORD_RE.findall(driver_lower):
+        for term in _KEYWORD_TERMS[hit]:
+            terms[term] = None
+    return tuple(terms)
+
+
+def _category_flags(category: str | None) -> tuple[bool, bool, bool, bool, bool, bool]:
+    cat_lower = (category or "").lower()
+    return (
+        "graphics" in cat_lower,
+        "audio" in cat_lower,
+        "network" in cat_lower,
+        "chipset" in cat_lower,
+        "storage" in cat_lower,
+        _contains_any(cat_lower, _BIOS_WORDS),
+    )
 
 
-def _name_score(driver_name: str, category: str | None, installed_name: str) -> int:
-    driver_norm = _normalize_name(driver_name)
-    installed_norm = _normalize_name(installed_name)
+def _name_score_fast(
+    driver_norm: str,
+    driver_tokens: frozenset[str],
+    search_terms: tuple[str, ...],
+    cat_flags: tuple[bool, bool, bool, bool, bool, bool],
+    installed_norm: str,
+) -> int:
     if not driver_norm or not installed_norm:
         return 0
     if "manageability" in installed_norm and "manageability" not in driver_norm:
-        if re.search(r"\b(wlan|wifi|wireless)\b", driver_norm):
+        if not _WLAN_TOKENS.isdisjoint(driver_tokens):
             return 0
     score = 0
-    for term in _build_search_terms(driver_name):
+    for term in search_terms:
         if term in installed_norm:
             score += 1
-    if category:
-        cat_lower = category.lower()
-        if "graphics" in cat_lower and re.search(r"graphics|display|video", installed_norm):
-            score += 2
-        if "audio" in cat_lower and re.search(r"audio|sound|realtek", installed_norm):
-            score += 2
-        if "network" in cat_lower and re.search(r"network|ethernet|wireless|wifi|bluetooth", installed_norm):
-            score += 2
-        if "chipset" in cat_lower and re.search(r"chipset|serial|management|usb", installed_norm):
-            score += 2
-        if "storage" in cat_lower and re.search(r"storage|rapid|rst|raid|optane", installed_norm):
-            score += 2
-        if re.search(r"bios|firmware", cat_lower) and re.search(r"bios|firmware", installed_norm):
-            score += 2
-    if driver_norm and driver_norm in installed_norm:
+    cat_graphics, cat_audio, cat_network, cat_chipset, cat_storage, cat_bios = cat_flags
+    if cat_graphics and _contains_any(installed_norm, _GRAPHICS_WORDS):
+        score += 2
+    if cat_audio and _contains_any(installed_norm, _AUDIO_WORDS):
+        score += 2
+    if cat_network and _contains_any(installed_norm, _NET_WORDS):
+        score += 2
+    if cat_chipset and _contains_any(installed_norm, _CHIPSET_WORDS):
+        score += 2
+    if cat_storage and _contains_any(installed_norm, _STORAGE_WORDS):
+        score += 2
+    if cat_bios and _contains_any(installed_norm, _BIOS_WORDS):
+        score += 2
+    if driver_norm in installed_norm:
         score += 3
     return score
 
 
-def _expected_classes(driver_name: str, category: str | None) -> set[str]:
+def _name_score(driver_name: str, category: str | None, installed_name: str) -> int:
+    driver_norm, driver_tokens = _tokenize_name(driver_name)
+    return _name_score_fast(
+        driver_norm,
+        driver_tokens,
+        _build_search_terms(driver_name),
+        _category_flags(category),
+        _normalize_name(installed_name),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _expected_classes(driver_name: str, category: str | None) -> frozenset[str]:
     name = _normalize_name(driver_name)
     cat = (category or "").lower()
     classes: set[str] = set()
-    if re.search(r"graphics|video|display", name) or "graphics" in cat or "display" in cat:
+    if _contains_any(name, _GRAPHICS_WORDS) or "graphics" in cat or "display" in cat:
         classes.add("display")
-    if re.search(r"audio|sound|realtek", name) or "audio" in cat:
+    if _contains_any(name, _AUDIO_WORDS) or "audio" in cat:
         classes.add("media")
-    if re.search(r"wireless|wlan|wifi|ethernet|network|bluetooth", name) or "network" in cat:
+    if _contains_any(name, _NET_CLASS_WORDS) or "network" in cat:
         classes.add("net")
         if "bluetooth" in name:
             classes.add("bluetooth")
-    if re.search(r"bluetooth", name) or "bluetooth" in cat:
+    if "bluetooth" in name or "bluetooth" in cat:
         classes.add("bluetooth")
         classes.add("net")
-    if re.search(r"storage|raid|rst|rapid|ssd|nvme", name) or "storage" in cat:
+    if _contains_any(name, _STORAGE_CLASS_WORDS) or "storage" in cat:
         classes.update({"scsiadapter", "hdc", "diskdrive"})
-    if re.search(r"chipset|serial|management engine|me driver|platform", name) or "chipset" in cat:
+    if _contains_any(name, _CHIPSET_CLASS_WORDS) or "chipset" in cat:
         classes.add("system")
-    if re.search(r"firmware|bios", name) or re.search(r"bios|firmware", cat):
+    if _contains_any(name, _BIOS_WORDS) or _contains_any(cat, _BIOS_WORDS):
         classes.update({"firmware", "system"})
-    return classes
+    return frozenset(classes)
 
 
 def _is_generic_installed(name: str, cmsl_name: str, cmsl_category: str | None) -> bool:
     inst_norm = _normalize_name(name)
-    cmsl_norm = _normalize_name(cmsl_name)
+    cmsl_norm, cmsl_tokens = _tokenize_name(cmsl_name)
     if "microsoft" in inst_norm and "microsoft" not in cmsl_norm:
         return True
     if "wan miniport" in inst_norm:
@@ -243,72 +395,129 @@ def _is_generic_installed(name: str, cmsl_name: str, cmsl_category: str | None)
         return True
     if "basic display adapter" in inst_norm and "display" not in cmsl_norm:
         return True
-    if "display audio" in inst_norm and not re.search(r"\baudio\b", cmsl_norm):
+    if "display audio" in inst_norm and "audio" not in cmsl_tokens:
         return True
-    if "u03 system firmware" in inst_norm and not re.search(r"\bfirmware\b|\bbios\b", cmsl_norm):
+    if "u03 system firmware" in inst_norm and _FIRMWARE_TOKENS.isdisjoint(cmsl_tokens):
         return True
     return False
 
 
+def _extract_installed_ids(
+    installed: list[dict[str, Any]],
+) -> tuple[list[frozenset[str]], list[frozenset[str]]]:
+    """Parse HWIDs/INF names for every installed row exactly once."""
+    installed_pnp: list[frozenset[str]] = []
+    installed_inf: list[frozenset[str]] = []
+    for inst in installed:
+        installed_pnp.append(frozenset(_extract_pnp_ids(_get_field(inst, "HardwareID", "HardwareIds", "DeviceID"))))
+        installed_inf.append(frozenset(_extract_inf_names(_get_field(inst, "InfName", "Inf"))))
+    return installed_pnp, installed_inf
+
+
+def _build_installed_index(
+    installed_pnp: list[frozenset[str]],
+    installed_inf: list[frozenset[str]],
+) -> tuple[dict[str, list[int]], dict[str, list[int]]]:
+    """Build inverted HWID/INF -> installed-row-index maps from parsed IDs."""
+    hwid_index: dict[str, list[int]] = {}
+    inf_index: dict[str, list[int]] = {}
+    for i, ids in enumerate(installed_pnp):
+        for hwid in ids:
+            hwid_index.setdefault(hwid, []).append(i)
+    for i, infs in enumerate(installed_inf):
+        for inf in infs:
+            inf_index.setdefault(inf, []).append(i)
+    return hwid_index, inf_index
+
+
+def _build_class_index(installed: list[dict[str, Any]]) -> dict[str, list[int]]:
+    """Bucket installed rows by lowercase device class for the name fallback.
+
+    Rows with an empty class land in the "" bucket; the fallback scan never
+    filters those out, so they are merged into every candidate set.
+    """
+    by_class: dict[str, list[int]] = {}
+    for i, inst in enumerate(installed):
+        by_class.setdefault(_flatten_installed_item(inst)["class"], []).append(i)
+    return by_class
+
+
 def _match_driver(
     cmsl_item: dict[str, Any],
     installed: list[dict[str, Any]],
+    index: tuple[dict[str, list[int]], dict[str, list[int]], dict[str, list[int]]],
     *,
     min_name_score: int,
     allow_name_fallback: bool = False,
 ) -> tuple[dict[str, Any] | None, str, int, dict[str, Any] | None, int]:
-    cmsl_name = str(_get_field(cmsl_item, "Name", "DeviceName") or "")
-    cmsl_cat = str(_get_field(cmsl_item, "Category", "Class", "ClassName") or "")
+    cmsl_flat = _flatten_cmsl_item(cmsl_item)
+    cmsl_name = cmsl_flat["name"]
+    cmsl_cat = cmsl_flat["category"]
     expected_classes = {c.lower() for c in _expected_classes(cmsl_name, cmsl_cat)}
-    cmsl_pnp = _extract_pnp_ids(
-        _get_field(cmsl_item, "HardwareID", "HardwareIds", "HWID", "DeviceID", "DeviceIds", "PnPIds", "SupportedDevices", "Devices")
-    )
-    cmsl_inf = _extract_inf_names(
-        _get_field(cmsl_item, "InfName", "INF", "Inf", "InfFiles", "CVA", "Description", "Notes")
-    )
+    cmsl_pnp = cmsl_flat["pnp"]
+    cmsl_inf = cmsl_flat["inf"]
     cmsl_has_ids = bool(cmsl_pnp or cmsl_inf)
 
+    # Loop-invariant pieces of the name score: all functions of the CMSL item.
+    cmsl_norm, cmsl_tokens = _tokenize_name(cmsl_name)
+    search_terms = _build_search_terms(cmsl_name)
+    cat_flags = _category_flags(cmsl_cat)
+
+    hwid_index, inf_index, class_index = index
+    id_hits: set[int] = set()
+    for hwid in cmsl_pnp:
+        id_hits.update(hwid_index.get(hwid, ()))
+    inf_hits: set[int] = set()
+    for inf in cmsl_inf:
+        inf_hits.update(inf_index.get(inf, ()))
+
     best: dict[str, Any] | None = None
     best_reason = "none"
     best_score = 0
     best_name: dict[str, Any] | None = None
     best_name_score = 0
 
-    for inst in installed:
-        inst_name = str(_get_field(inst, "DeviceName", "Name") or "")
-        if _is_generic_installed(inst_name, cmsl_name, cmsl_cat):
-            continue
-        inst_class = str(_get_field(inst, "Class") or "").lower()
-        inst_ids = _extract_pnp_ids(_get_field(inst, "HardwareID", "HardwareIds", "DeviceID"))
-        inst_infs = _extract_inf_names(_get_field(inst, "InfName", "Inf"))
-
-        id_score = 0
-        if cmsl_pnp and inst_ids and (cmsl_pnp & inst_ids):
-            id_score = 100
-
-        inf_score = 0
-        if cmsl_inf and inst_infs and (cmsl_inf & inst_infs):
-            inf_score = 80
-
-        name_score = _name_score(cmsl_name, cmsl_cat, inst_name)
-        score = max(id_score, inf_score, name_score)
-        reason = "name"
-        if id_score:
-            reason = "hwid"
-        elif inf_score:
-            reason = "inf"
-
-        if reason == "name" and expected_classes and inst_class and inst_class not in expected_classes:
-            continue
-
-        if score > best_score:
-            best_score = score
-            best_reason = reason
+    # ID/INF candidates come straight from the inverted indexes; an HWID hit
+    # always outranks an INF hit, which always outranks any name score.
+    for tier_score, tier_reason, hits in ((100, "hwid", id_hits), (80, "inf", inf_hits)):
+        if best is not None:
+            break
+        for i in sorted(hits):
+            inst = installed[i]
+            inst_name = _flatten_installed_item(inst)["name"]
+            if _is_generic_installed(inst_name, cmsl_name, cmsl_cat):
+                continue
+            # An exact ID/INF match cannot be beaten within its tier, and the
+            # name-candidate fields only matter for no_hwid_match rows.
             best = inst
-
-        if name_score > best_name_score:
-            best_name_score = name_score
-            best_name = inst
+            best_reason = tier_reason
+            best_score = tier_score
+            break
+
+    if best is None:
+        # Name-only fallback: visit only the class buckets that can pass the
+        # filter (plus rows with no class, which the filter never excludes).
+        if expected_classes:
+            candidate_idxs: set[int] = set(class_index.get("", ()))
+            for cls in expected_classes:
+                candidate_idxs.update(class_index.get(cls, ()))
+            candidates = sorted(candidate_idxs)
+        else:
+            candidates = range(len(installed))
+        for i in candidates:
+            inst = installed[i]
+            inst_flat = _flatten_installed_item(inst)
+            inst_name = inst_flat["name"]
+            if _is_generic_installed(inst_name, cmsl_name, cmsl_cat):
+                continue
+            name_score = _name_score_fast(cmsl_norm, cmsl_tokens, search_terms, cat_flags, _normalize_name(inst_name))
+            if name_score > best_score:
+                best_score = name_score
+                best_reason = "name"
+                best = inst
+            if name_score > best_name_score:
+                best_name_score = name_score
+                best_name = inst
 
     if best_reason == "name":
         if best_score < min_name_score:
@@ -330,18 +539,19 @@ def _is_driver_cmsl_item(item: dict[str, Any]) -> bool:
     category = str(_get_field(item, "Category", "Class", "ClassName") or "")
     name = str(_get_field(item, "Name", "DeviceName") or "")
     text = f"{category} {name}".lower()
-    if re.search(r"\bbios\b|\bfirmware\b", text):
+    if _DRIVER_TEXT_RE.search(text):
         return True
     if "driver" in text:
         return True
     return False
 
 
+@functools.lru_cache(maxsize=2048)
 def _version_tuple(value: str | None) -> tuple[int, ...] | None:
     if not value:
         return None
     text = str(value)
-    match = re.search(r"(\d+(?:\.\d+){0,4})", text)
+    match = _VERSION_RE.search(text)
     if match:
         text = match.group(1)
     parts = text.split(".")
@@ -353,6 +563,19 @@ def _version_tuple(value: str | None) -> tuple[int, ...] | None:
     return tuple(out) if out else None
 
 
+_MISSING_TEXT = {True: "missing", False: "ok", None: "unknown"}
+
+
+def _is_missing(code: Any) -> bool | None:
+    """ConfigManagerErrorCode 28 means no driver is installed for the device."""
+    if code is None:
+        return None
+    try:
+        return int(code) == 28
+    except (TypeError, ValueError):
+        return None
+
+
 def _compare_versions(installed: str | None, available: str | None) -> str:
     inst = _version_tuple(installed)
     avail = _version_tuple(available)
@@ -366,8 +589,54 @@ def _compare_versions(installed: str | None, available: str | None) -> str:
 
 
 def _load_json_file(path: str) -> Any:
-    with open(path, "r", encoding="utf-8") as handle:
-        return json.load(handle)
+    # Binary read: orjson takes raw bytes and skips the UTF-8 decode pass.
+    with open(path, "rb") as handle:
+        return _json_loads(handle.read())
+
+
+def _stream_powershell_ndjson(script: str, *, timeout: int = 120) -> list[dict[str, Any]]:
+    """Run a PowerShell pipeline emitting one JSON object per line.
+
+    Parsing overlaps with PowerShell still producing output, and neither side
+    ever buffers the whole document.
+    """
+    if not shutil.which("powershell"):
+        raise RuntimeError("powershell not found on PATH")
+    proc = subprocess.Popen(
+        ["powershell", "-NoProfile", "-Command", script],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    items: list[dict[str, Any]] = []
+    assert proc.stdout is not None
+    # Drain stderr on a separate thread so a chatty process cannot fill the
+    # stderr pipe and deadlock while we are still reading stdout.
+    stderr_parts: list[str] = []
+    stderr_thread: threading.Thread | None = None
+    if proc.stderr is not None:
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_parts.append(proc.stderr.read()),
+            daemon=True,
+        )
+        stderr_thread.start()
+    for line in proc.stdout:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = _json_loads(line)
+        except ValueError:
+            continue
+        if isinstance(obj, dict):
+            items.append(obj)
+    returncode = proc.wait(timeout=timeout)
+    if stderr_thread is not None:
+        stderr_thread.join()
+    if returncode != 0:
+        stderr = "".join(stderr_parts)
+        raise RuntimeError(stderr.strip() or "powershell command failed")
+    return items
 
 
 def _load_cmsl(args: argparse.Namespace) -> list[dict[str, Any]]:
@@ -380,9 +649,9 @@ def _load_cmsl(args: argparse.Namespace) -> list[dict[str, Any]]:
         script = (
             "Import-Module HPCMSL -ErrorAction Stop; "
             f"$sp = Get-SoftpaqList -Platform '{platform}' -Os {args.os} -OsVer {args.osver} -ErrorAction Stop; "
-            "$sp | ConvertTo-Json -Depth 6"
+            "$sp | ForEach-Object { $_ | ConvertTo-Json -Compress -Depth 6 }"
         )
-        data = json.loads(_run_powershell(script))
+        data = _stream_powershell_ndjson(script)
     if isinstance(data, dict):
         data = [data]
     return [item for item in data if isinstance(item, dict)]
@@ -397,10 +666,35 @@ def _meta_keys(items: Iterable[dict[str, Any]]) -> list[str]:
     return sorted(keys)
 
 
-def _fetch_cmsl_metadata(softpaq_ids: list[str]) -> dict[str, dict[str, Any]]:
+def _read_meta_cache(cache_path: str) -> dict[str, dict[str, Any]]:
+    try:
+        data = _load_json_file(cache_path)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {sid: meta for sid, meta in data.items() if isinstance(meta, dict)}
+
+
+def _write_meta_cache(cache_path: str, cache: dict[str, dict[str, Any]]) -> None:
+    try:
+        with open(cache_path, "w", encoding="utf-8") as handle:
+            handle.write(_json_dumps(cache))
+    except OSError:
+        pass
+
+
+def _fetch_cmsl_metadata(softpaq_ids: list[str], cache_path: str | None = None) -> dict[str, dict[str, Any]]:
     if not softpaq_ids:
         return {}
-    ids_literal = ",".join(f"'{sid}'" for sid in softpaq_ids)
+    cached: dict[str, dict[str, Any]] = {}
+    if cache_path:
+        cached = _read_meta_cache(cache_path)
+    missing = [sid for sid in softpaq_ids if sid not in cached]
+    mapping = {sid: cached[sid] for sid in softpaq_ids if sid in cached}
+    if not missing:
+        return mapping
+    ids_literal = ",".join(f"'{sid}'" for sid in missing)
     script = rf"""
     Import-Module HPCMSL -ErrorAction Stop
     $ids = @({ids_literal})
@@ -409,30 +703,39 @@ def _fetch_cmsl_metadata(softpaq_ids: list[str]) -> dict[str, dict[str, Any]]:
         Write-Output "__NO_METADATA_CMDLET__"
         return
     }}
-    $results = @()
-    foreach ($id in $ids) {{
-        try {{
-            $m = Get-SoftpaqMetadata -Number $id -ErrorAction Stop
-            if ($m) {{
-                $results += [PSCustomObject]@{{ Id = $id; Meta = $m }}
+    if ($PSVersionTable.PSVersion.Major -ge 7) {{
+        $results = $ids | ForEach-Object -ThrottleLimit 8 -Parallel {{
+            try {{
+                $m = Get-SoftpaqMetadata -Number $_ -ErrorAction Stop
+                if ($m) {{ [PSCustomObject]@{{ Id = $_; Meta = $m }} }}
+            }} catch {{
+            }}
+        }}
+    }} else {{
+        $results = @()
+        foreach ($id in $ids) {{
+            try {{
+                $m = Get-SoftpaqMetadata -Number $id -ErrorAction Stop
+                if ($m) {{
+                    $results += [PSCustomObject]@{{ Id = $id; Meta = $m }}
+                }}
+            }} catch {{
             }}
-        }} catch {{
         }}
     }}
     $results | ConvertTo-Json -Depth 8
     """
     output = _run_powershell(script).strip()
     if not output:
-        return {}
+        return mapping
     if "__NO_METADATA_CMDLET__" in output:
         raise RuntimeError("HPCMSL Get-SoftpaqMetadata cmdlet not available")
     try:
-        data = json.loads(output)
-    except json.JSONDecodeError:
-        return {}
+        data = _json_loads(output)
+    except ValueError:
+        return mapping
     if isinstance(data, dict):
         data = [data]
-    mapping: dict[str, dict[str, Any]] = {}
     for item in data or []:
         if not isinstance(item, dict):
             continue
@@ -440,6 +743,9 @@ def _fetch_cmsl_metadata(softpaq_ids: list[str]) -> dict[str, dict[str, Any]]:
         meta = item.get("Meta")
         if sid and isinstance(meta, dict):
             mapping[sid] = meta
+            cached[sid] = meta
+    if cache_path:
+        _write_meta_cache(cache_path, cached)
     return mapping
 
 
@@ -455,9 +761,9 @@ def _load_installed(args: argparse.Namespace) -> list[dict[str, Any]]:
         Get-WmiObject Win32_PnPSignedDriver -ErrorAction SilentlyContinue |
         Select-Object DeviceName, DriverVersion, Manufacturer, DeviceID, HardwareID, InfName, ClassGuid, Class, DriverDate,
             @{n='ConfigManagerErrorCode';e={ $entities[$_.DeviceID] }} |
-        ConvertTo-Json -Depth 4
+        ForEach-Object { $_ | ConvertTo-Json -Compress -Depth 4 }
         """
-        data = json.loads(_run_powershell(script))
+        data = _stream_powershell_ndjson(script)
     if isinstance(data, dict):
         data = [data]
     return [item for item in data if isinstance(item, dict)]
@@ -484,6 +790,81 @@ def _detect_platform_id() -> str | None:
     return output or None
 
 
+def _iter_hpia_rows(hpia_items: list[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+    for item in hpia_items:
+        name = str(_get_field(item, "Name") or "")
+        category = str(_get_field(item, "Category") or "")
+        available = _get_field(item, "Version")
+        installed_ver = _get_field(item, "CurrentVersion")
+        softpaq_id = _get_field(item, "SoftPaqId")
+        rec_value = _get_field(item, "RecommendationValue") or ""
+        status = _compare_versions(installed_ver, available)
+        yield {
+            "source": "HPIA",
+            "cmsl_name": name,
+            "cmsl_category": category,
+            "cmsl_version": available,
+            "cmsl_id": softpaq_id,
+            "match_name": name,
+            "match_version": installed_ver,
+            "match_reason": rec_value or status,
+            "match_score": 0,
+            "match_config_error": None,
+            "missing_driver": None,
+            "name_candidate": "",
+            "name_candidate_version": None,
+            "name_candidate_score": 0,
+        }
+
+
+def _iter_cmsl_rows(
+    cmsl_items: list[dict[str, Any]],
+    installed: list[dict[str, Any]],
+    installed_index: tuple[dict[str, list[int]], dict[str, list[int]], dict[str, list[int]]],
+    hpia_softpaqs: set[str],
+    hpia_names: set[str],
+    args: argparse.Namespace,
+) -> Iterable[dict[str, Any]]:
+    for item in cmsl_items:
+        flat = _flatten_cmsl_item(item)
+        name = flat["name"]
+        category = flat["category"]
+        version = flat["version"]
+        softpaq_id = flat["id"]
+        if softpaq_id and str(softpaq_id) in hpia_softpaqs:
+            continue
+        if _normalize_name(name) in hpia_names:
+            continue
+        match, reason, score, name_candidate, name_score = _match_driver(
+            item,
+            installed,
+            installed_index,
+            min_name_score=args.min_score,
+            allow_name_fallback=args.allow_name_fallback,
+        )
+        if match is None and not args.show_unmatched:
+            continue
+        match_flat = match["_flat"] if match is not None else {}
+        match_code = match_flat.get("config_code")
+        candidate_flat = name_candidate["_flat"] if name_candidate is not None else {}
+        yield {
+            "source": "CMSL",
+            "cmsl_name": name,
+            "cmsl_category": category,
+            "cmsl_version": version,
+            "cmsl_id": softpaq_id,
+            "match_name": match_flat.get("name", ""),
+            "match_version": match_flat.get("version"),
+            "match_reason": reason,
+            "match_score": score,
+            "match_config_error": match_code,
+            "missing_driver": _is_missing(match_code),
+            "name_candidate": candidate_flat.get("name", ""),
+            "name_candidate_version": candidate_flat.get("version"),
+            "name_candidate_score": name_score,
+        }
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Debug driver update matching (hybrid HWID/INF/name).")
     parser.add_argument("--cmsl-json", help="Path to CMSL JSON output (from Get-SoftpaqList)")
@@ -500,6 +881,11 @@ def main() -> int:
     parser.add_argument("--list-installed", action="store_true", help="List installed drivers and exit")
     parser.add_argument("--enrich-cmsl", action="store_true", help="Fetch CMSL metadata (HWID/INF) via Get-SoftpaqMetadata")
     parser.add_argument("--enrich-limit", type=int, default=200, help="Max number of CMSL items to enrich (default: 200)")
+    parser.add_argument(
+        "--meta-cache",
+        default=os.path.join(os.getcwd(), "_cmsl_meta_cache.json"),
+        help="On-disk cache for Get-SoftpaqMetadata results (empty string disables)",
+    )
     parser.add_argument("--dump-meta-keys", action="store_true", help="Print CMSL metadata keys and exit")
     parser.add_argument("--hpia-report", help="HPIA JSON report file or report folder")
     parser.add_argument("--hpia-run", action="store_true", help="Run HPIA analyze and load the latest report")
@@ -532,14 +918,14 @@ def main() -> int:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
 
+    installed_pnp, installed_inf = _extract_installed_ids(installed)
+    for inst in installed:
+        _flatten_installed_item(inst)
+
     if args.list_installed:
-        for inst in installed:
-            name = str(_get_field(inst, "DeviceName", "Name") or "")
-            ver = _get_field(inst, "DriverVersion")
-            cls = _get_field(inst, "Class")
-            hwids = _extract_pnp_ids(_get_field(inst, "HardwareID", "HardwareIds", "DeviceID"))
-            infs = _extract_inf_names(_get_field(inst, "InfName", "Inf"))
-            print(f"{name} | {ver} | {cls} | hwid={len(hwids)} inf={len(infs)}")
+        for inst, hwids, infs in zip(installed, installed_pnp, installed_inf):
+            flat = inst["_flat"]
+            print(f"{flat['name']} | {flat['version']} | {flat['class']} | hwid={len(hwids)} inf={len(infs)}")
         return 0
 
     try:
@@ -580,7 +966,7 @@ def main() -> int:
             if len(ids) >= args.enrich_limit:
                 break
         try:
-            meta_map = _fetch_cmsl_metadata(ids)
+            meta_map = _fetch_cmsl_metadata(ids, cache_path=args.meta_cache or None)
         except Exception as exc:
             print(f"Warning: CMSL metadata enrichment failed: {exc}", file=sys.stderr)
             meta_map = {}
@@ -608,95 +994,41 @@ def main() -> int:
         print("CMSL meta keys:", ", ".join(keys))
         return 0
 
-    results: list[dict[str, Any]] = []
-    for item in hpia_items:
-        name = str(_get_field(item, "Name") or "")
-        category = str(_get_field(item, "Category") or "")
-        available = _get_field(item, "Version")
-        installed_ver = _get_field(item, "CurrentVersion")
-        softpaq_id = _get_field(item, "SoftPaqId")
-        rec_value = _get_field(item, "RecommendationValue") or ""
-        status = _compare_versions(installed_ver, available)
-        results.append(
-            {
-                "source": "HPIA",
-                "cmsl_name": name,
-                "cmsl_category": category,
-                "cmsl_version": available,
-                "cmsl_id": softpaq_id,
-                "match_name": name,
-                "match_version": installed_ver,
-                "match_reason": rec_value or status,
-                "match_score": 0,
-                "match_config_error": None,
-                "missing_driver": None,
-                "name_candidate": "",
-                "name_candidate_version": None,
-                "name_candidate_score": 0,
-            }
-        )
-    for item in cmsl_items:
-        name = str(_get_field(item, "Name", "DeviceName") or "")
-        category = str(_get_field(item, "Category", "Class", "ClassName") or "")
-        version = _get_field(item, "Version")
-        softpaq_id = _get_field(item, "Id", "SoftPaqId", "Number")
-        if softpaq_id and str(softpaq_id) in hpia_softpaqs:
-            continue
-        if _normalize_name(name) in hpia_names:
-            continue
-        match, reason, score, name_candidate, name_score = _match_driver(
-            item,
-            installed,
-            min_name_score=args.min_score,
-            allow_name_fallback=args.allow_name_fallback,
-        )
-        if match is None and not args.show_unmatched:
-            continue
-        match_name = str(_get_field(match or {}, "DeviceName", "Name") or "")
-        match_version = _get_field(match or {}, "DriverVersion")
-        match_code = _get_field(match or {}, "ConfigManagerErrorCode")
-        missing_driver = None
-        if isinstance(match_code, int):
-            missing_driver = match_code == 28
-        elif isinstance(match_code, str) and match_code.isdigit():
-            missing_driver = int(match_code) == 28
-        name_candidate_name = str(_get_field(name_candidate or {}, "DeviceName", "Name") or "")
-        name_candidate_version = _get_field(name_candidate or {}, "DriverVersion")
-        results.append(
-            {
-                "source": "CMSL",
-                "cmsl_name": name,
-                "cmsl_category": category,
-                "cmsl_version": version,
-                "cmsl_id": softpaq_id,
-                "match_name": match_name,
-                "match_version": match_version,
-                "match_reason": reason,
-                "match_score": score,
-                "match_config_error": match_code,
-                "missing_driver": missing_driver,
-                "name_candidate": name_candidate_name,
-                "name_candidate_version": name_candidate_version,
-                "name_candidate_score": name_score,
-            }
-        )
+    hwid_index, inf_index = _build_installed_index(installed_pnp, installed_inf)
+    installed_index = (hwid_index, inf_index, _build_class_index(installed))
+
+    rows = itertools.chain(
+        _iter_hpia_rows(hpia_items),
+        _iter_cmsl_rows(cmsl_items, installed, installed_index, hpia_softpaqs, hpia_names, args),
+    )
 
     if args.output_json:
+        # Stream one row at a time so peak memory stays O(1) in the row count
+        # and Ctrl-C keeps the rows written so far.
         with open(args.output_json, "w", encoding="utf-8") as handle:
-            json.dump(results, handle, indent=2)
+            handle.write("[\n")
+            first = True
+            for row in rows:
+                if not first:
+                    handle.write(",\n")
+                handle.write(_json_dump_row(row))
+                first = False
+            handle.write("\n]\n")
     else:
-        for row in results:
+        lines: list[str] = []
+        for row in rows:
             status = row["match_reason"]
-            missing = row["missing_driver"]
-            missing_text = "missing" if missing else ("ok" if missing is False else "unknown")
+            missing_text = _MISSING_TEXT[row["missing_driver"]]
             candidate = ""
             if row["match_reason"] == "no_hwid_match" and row["name_candidate"]:
                 candidate = f" | name-candidate: {row['name_candidate']} ({row['name_candidate_version']}) score={row['name_candidate_score']}"
-            print(
+            lines.append(
                 f"[{row['source']} {status}/{row['match_score']}] {missing_text} "
                 f"{row['cmsl_name']} ({row['cmsl_version']}) -> {row['match_name']} ({row['match_version']})"
                 f"{candidate}"
             )
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 
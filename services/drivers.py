@@ -1,14 +1,18 @@
 """Driver scanning and installation services using HP tooling."""
 from __future__ import annotations
 
+import functools
 import json
 import os
 import re
 import shutil
 import subprocess
+import time
 import urllib.error
 import urllib.request
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Callable, Iterable, Protocol, Sequence
 
@@ -19,8 +23,31 @@ try:
 except ImportError:
     winreg = None  # type: ignore[assignment]
 
+try:
+    import orjson  # type: ignore[import-not-found]
 
-@dataclass
+    _json_loads = orjson.loads
+    _JSON_DECODE_ERRORS: tuple[type[Exception], ...] = (json.JSONDecodeError, orjson.JSONDecodeError)
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    _json_loads = json.loads
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+try:
+    import ijson  # type: ignore[import-not-found]
+except ImportError:
+    ijson = None  # type: ignore[assignment]
+
+try:
+    import requests  # type: ignore[import-not-found]
+except ImportError:
+    requests = None  # type: ignore[assignment]
+
+# Reports smaller than this are cheaper to parse in one shot.
+_HPIA_STREAM_THRESHOLD = 1 << 20
+
+
+@dataclass(slots=True)
 class DriverRecord:
     name: str
     status: str
@@ -62,6 +89,42 @@ class InstalledItem:
     publisher: str | None = None
 
 
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_RE_WIFI = re.compile(r"wi[-\s]fi")
+_RE_BIOS = re.compile(r"\bbios\b")
+_RE_WIRELESS = re.compile(r"wireless|wlan|wifi|wi-fi")
+_RE_WLAN_WORD = re.compile(r"\b(wlan|wifi|wireless)\b")
+_RE_GRAPHICS = re.compile(r"graphics|video|display")
+_RE_AUDIO = re.compile(r"audio|sound")
+_RE_ETHERNET = re.compile(r"ethernet|nic|network")
+_RE_STORAGE = re.compile(r"storage|raid|rst|rapid")
+_RE_MGMT_ENGINE = re.compile(r"management engine|me driver")
+_RE_SERIAL_IO = re.compile(r"serial io|serialio")
+_RE_ARC = re.compile(r"arc|a380|a770")
+_RE_CAT_GRAPHICS = re.compile(r"graphics|display|video")
+_RE_CAT_AUDIO = re.compile(r"audio|sound|realtek")
+_RE_CAT_NETWORK = re.compile(r"network|ethernet|wireless|wifi|bluetooth")
+_RE_CAT_CHIPSET = re.compile(r"chipset|serial|management|usb")
+_RE_CAT_STORAGE = re.compile(r"storage|rapid|rst|raid|optane")
+_RE_FIRMWARE = re.compile(r"firmware")
+_RE_HP_MAKER = re.compile(r"HP|Hewlett|Packard", re.IGNORECASE)
+_RE_GEN = re.compile(r"G(\d+)")
+_RE_HPIA_MODELS = re.compile(r"Z[0-9]+ G|ZBook.*G[3-9]|Elite.*G[3-9]|Pro.*G[3-9]", re.IGNORECASE)
+_RE_WIN78 = re.compile(r"Windows 7|Windows 8", re.IGNORECASE)
+_RE_COMPAQ = re.compile(r"Compaq|Pro3?500|dc\d{4}|8[0-3]00", re.IGNORECASE)
+
+_CATEGORY_PROBE_WORDS = {
+    "graphics": ("graphics", "display", "video"),
+    "audio": ("audio", "sound", "realtek"),
+    "network": ("network", "ethernet", "wireless", "wifi", "bluetooth"),
+    "chipset": ("chipset", "serial", "management", "usb"),
+    "storage": ("storage", "rapid", "rst", "raid", "optane"),
+    "bios": ("bios",),
+    "firmware": ("firmware",),
+}
+
+
+@functools.lru_cache(maxsize=4096)
 def _normalize_version(version_str: str | None) -> str:
     if not version_str:
         return "0.0.0.0"
@@ -71,44 +134,38 @@ def _normalize_version(version_str: str | None) -> str:
     return ".".join(parts[:4])
 
 
-def _compare_versions(installed: str | None, available: str | None) -> int | None:
-    if not installed or not available:
+@functools.lru_cache(maxsize=8192)
+def _version_tuple(version_str: str | None) -> tuple[int, int, int, int] | None:
+    """Numeric 4-tuple for a dotted version, or None when not comparable."""
+    if not version_str:
         return None
-    norm_installed = _normalize_version(installed)
-    norm_available = _normalize_version(available)
     try:
-        inst_parts = [int(p) for p in norm_installed.split(".")]
-        avail_parts = [int(p) for p in norm_available.split(".")]
-        if avail_parts > inst_parts:
-            return 1
-        if avail_parts < inst_parts:
-            return -1
-        return 0
-    except (ValueError, AttributeError):
+        values = [int(p) for p in version_str.strip().split(".")[:4]]
+    except ValueError:
         return None
+    while len(values) < 4:
+        values.append(0)
+    return tuple(values)  # type: ignore[return-value]
 
 
 def _compare_version_strings(left: str | None, right: str | None) -> int | None:
-    if not left or not right:
-        return None
-    norm_left = _normalize_version(left)
-    norm_right = _normalize_version(right)
-    try:
-        left_parts = [int(p) for p in norm_left.split(".")]
-        right_parts = [int(p) for p in norm_right.split(".")]
-        if left_parts < right_parts:
-            return -1
-        if left_parts > right_parts:
-            return 1
-        return 0
-    except (ValueError, AttributeError):
+    """Sign of left minus right, or None when either side is not comparable."""
+    left_t = _version_tuple(left)
+    right_t = _version_tuple(right)
+    if left_t is None or right_t is None:
         return None
+    return (left_t > right_t) - (left_t < right_t)
+
+
+def _compare_versions(installed: str | None, available: str | None) -> int | None:
+    """Positive when an update is available; argument order kept for callers."""
+    return _compare_version_strings(available, installed)
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_name(value: str) -> str:
-    text = value.lower()
-    text = text.replace("wi-fi", "wifi").replace("wi fi", "wifi")
-    text = re.sub(r"[^a-z0-9]+", " ", text)
+    text = _RE_WIFI.sub("wifi", value.lower())
+    text = _RE_NON_ALNUM.sub(" ", text)
     return text.strip()
 
 
@@ -137,6 +194,76 @@ def _categorize_cmsl(category: str | None, name: str | None) -> str:
     return "Other"
 
 
+class InstalledIndex:
+    """Inverted token index over the installed-software cache.
+
+    Matching a scan result against the cache used to walk every installed
+    item per driver; the index narrows each lookup to the few items sharing
+    a token with the driver's search terms.
+    """
+
+    def __init__(self, installed: dict[str, InstalledItem]) -> None:
+        self.by_name: dict[str, InstalledItem] = installed
+        self.by_norm: dict[str, InstalledItem] = {}
+        self.records: list[InstalledItem] = []
+        self.norms: list[str] = []
+        self.by_token: dict[str, list[int]] = {}
+        self._probe_cache: dict[str, list[int]] = {}
+        for idx, (name, item) in enumerate(installed.items()):
+            norm = _normalize_name(name)
+            self.records.append(item)
+            self.norms.append(norm)
+            self.by_norm.setdefault(norm, item)
+            for token in set(norm.split()):
+                self.by_token.setdefault(token, []).append(idx)
+
+    def get(self, key: str) -> InstalledItem | None:
+        return self.by_name.get(key)
+
+    # Dict-compatible view for callers that still treat the cache as
+    # {lowercased name: InstalledItem}.
+    def __getitem__(self, key: str) -> InstalledItem:
+        return self.by_name[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.by_name
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def __iter__(self) -> Iterable[str]:
+        return iter(self.by_name)
+
+    def keys(self):
+        return self.by_name.keys()
+
+    def values(self):
+        return self.by_name.values()
+
+    def items(self):
+        return self.by_name.items()
+
+    def candidates(self, probe_words: Iterable[str]) -> list[int]:
+        """Indices of items whose normalized name contains any probe word.
+
+        Probe words are space-free, so a substring hit on the full
+        normalized name implies a substring hit on one of its tokens;
+        scanning the (much smaller) token vocabulary therefore yields a
+        superset of the items the scoring loop can match.
+        """
+        hits: set[int] = set()
+        for word in probe_words:
+            postings = self._probe_cache.get(word)
+            if postings is None:
+                postings = []
+                for token, indices in self.by_token.items():
+                    if word in token:
+                        postings.extend(indices)
+                self._probe_cache[word] = postings
+            hits.update(postings)
+        return sorted(hits)
+
+
 def _dedupe_latest_records(records: list[DriverRecord]) -> list[DriverRecord]:
     best: dict[str, DriverRecord] = {}
     for record in records:
@@ -156,16 +283,16 @@ def _dedupe_latest_records(records: list[DriverRecord]) -> list[DriverRecord]:
     return list(best.values())
 
 
-def get_hp_system_info(*, powershell: str = "powershell") -> HPSystemInfo:
-    info = HPSystemInfo()
-    if not shutil.which(powershell):
-        return info
-    script = """
-    $cs = Get-WmiObject Win32_ComputerSystem
-    $bios = Get-WmiObject Win32_BIOS
-    $bb = Get-WmiObject Win32_BaseBoard
-    $os = Get-WmiObject Win32_OperatingSystem
-    $csProduct = Get-WmiObject Win32_ComputerSystemProduct
+_PS_ARGS = ("-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command")
+
+_PS_UTF8_PREAMBLE = "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8"
+
+_PS_SYSTEM_BODY = """
+    $cs = Get-CimInstance Win32_ComputerSystem -OperationTimeoutSec 5
+    $bios = Get-CimInstance Win32_BIOS -OperationTimeoutSec 5
+    $bb = Get-CimInstance Win32_BaseBoard -OperationTimeoutSec 5
+    $os = Get-CimInstance Win32_OperatingSystem -OperationTimeoutSec 5
+    $csProduct = Get-CimInstance Win32_ComputerSystemProduct -OperationTimeoutSec 5
     $result = @{
         Manufacturer = $cs.Manufacturer
         Model = $cs.Model
@@ -183,46 +310,9 @@ def get_hp_system_info(*, powershell: str = "powershell") -> HPSystemInfo:
             $result.ProductCode = $biosReg.SystemSKU
         }
     }
-    $result | ConvertTo-Json -Compress
     """
-    try:
-        result = subprocess.run([powershell, "-NoProfile", "-Command", script], capture_output=True, text=True, check=False, timeout=10)
-        if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            manufacturer = data.get("Manufacturer", "")
-            model = data.get("Model", "")
-            os_version = data.get("OSVersion", "")
-            if re.search(r"HP|Hewlett|Packard", manufacturer, re.IGNORECASE):
-                info.manufacturer = manufacturer
-                info.model = model
-                info.serial_number = data.get("SerialNumber")
-                info.platform_id = data.get("ProductCode") or data.get("SKU")
-                info.sku = data.get("SKU")
-                info.os_version = os_version
-                info.os_build = data.get("OSBuild")
-                gen_match = re.search(r"G(\d+)", model)
-                if gen_match:
-                    info.generation = int(gen_match.group(1))
-                info.supports_hpia = (info.generation is not None and info.generation >= 3) or bool(
-                    re.search(r"Z[0-9]+ G|ZBook.*G[3-9]|Elite.*G[3-9]|Pro.*G[3-9]", model, re.IGNORECASE)
-                )
-                if re.search(r"Windows 7|Windows 8", os_version, re.IGNORECASE):
-                    info.supports_cmsl = False
-                else:
-                    info.supports_cmsl = True
-                if re.search(r"Compaq|Pro3?500|dc\d{4}|8[0-3]00", model, re.IGNORECASE):
-                    info.supports_hpia = False
-                    info.supports_cmsl = False
-    except (subprocess.TimeoutExpired, json.JSONDecodeError, ValueError):
-        pass
-    return info
 
-
-def get_installed_drivers_and_software(*, powershell: str = "powershell") -> dict[str, InstalledItem]:
-    installed: dict[str, InstalledItem] = {}
-    if not shutil.which(powershell):
-        return installed
-    script = """
+_PS_INSTALLED_BODY = """
     $items = @()
     $regPaths = @(
         'HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\*',
@@ -255,110 +345,431 @@ def get_installed_drivers_and_software(*, powershell: str = "powershell") -> dic
             Type = 'BIOS'
         }
     }
-    $items | ConvertTo-Json -Depth 2 -Compress
     """
+
+
+def _parse_hp_system_info(data: dict) -> HPSystemInfo:
+    info = HPSystemInfo()
+    manufacturer = data.get("Manufacturer", "")
+    model = data.get("Model", "")
+    os_version = data.get("OSVersion", "")
+    if _RE_HP_MAKER.search(manufacturer):
+        info.manufacturer = manufacturer
+        info.model = model
+        info.serial_number = data.get("SerialNumber")
+        info.platform_id = data.get("ProductCode") or data.get("SKU")
+        info.sku = data.get("SKU")
+        info.os_version = os_version
+        info.os_build = data.get("OSBuild")
+        gen_match = _RE_GEN.search(model)
+        if gen_match:
+            info.generation = int(gen_match.group(1))
+        info.supports_hpia = (info.generation is not None and info.generation >= 3) or bool(
+            _RE_HPIA_MODELS.search(model)
+        )
+        if _RE_WIN78.search(os_version):
+            info.supports_cmsl = False
+        else:
+            info.supports_cmsl = True
+        if _RE_COMPAQ.search(model):
+            info.supports_hpia = False
+            info.supports_cmsl = False
+    return info
+
+
+def _add_installed_item(installed: dict[str, InstalledItem], item: object) -> None:
+    if not isinstance(item, dict):
+        return
+    name = item.get("Name", "").lower().strip()
+    version = item.get("Version", "")
+    publisher = item.get("Publisher")
+    if name and version and name not in installed:
+        installed[name] = InstalledItem(name=item.get("Name", ""), version=version, publisher=publisher)
+
+
+def _parse_installed_items(data: object) -> dict[str, InstalledItem]:
+    installed: dict[str, InstalledItem] = {}
+    if not isinstance(data, list):
+        data = [data]
+    for item in data:
+        _add_installed_item(installed, item)
+    return installed
+
+
+def _parse_ps_json(raw: bytes | str) -> Sequence[dict]:
+    """Decode PowerShell ConvertTo-Json output into a sequence of objects.
+
+    ConvertTo-Json unwraps single-element arrays and the console may prepend
+    a BOM; empty output short-circuits without paying for an exception.
+    """
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    raw = raw.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if not raw:
+        return ()
     try:
-        result = subprocess.run([powershell, "-NoProfile", "-Command", script], capture_output=True, text=True, check=False, timeout=30)
-        if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            if not isinstance(data, list):
-                data = [data]
-            for item in data:
-                if not isinstance(item, dict):
+        data = _json_loads(raw)
+    except ValueError:
+        return ()
+    if isinstance(data, dict):
+        return (data,)
+    if isinstance(data, list):
+        return data
+    return ()
+
+
+def _read_registry_system_data() -> dict[str, str]:
+    """Read the BIOS/OS identification values directly from the registry.
+
+    Returns the same keys _parse_hp_system_info expects; empty when winreg
+    is unavailable or the keys cannot be read.
+    """
+    if winreg is None:
+        return {}
+    data: dict[str, str] = {}
+    bios_values = {
+        "SystemManufacturer": "Manufacturer",
+        "SystemProductName": "Model",
+        "BaseBoardProduct": "ProductCode",
+        "SystemSKU": "SKU",
+    }
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\BIOS") as key:
+            for value_name, data_key in bios_values.items():
+                try:
+                    value, _ = winreg.QueryValueEx(key, value_name)
+                except OSError:
+                    continue
+                if value:
+                    data[data_key] = str(value)
+    except OSError:
+        return {}
+    sku = data.get("SKU")
+    if sku and (not data.get("ProductCode") or len(data["ProductCode"]) < 4):
+        data["ProductCode"] = sku
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows NT\CurrentVersion") as key:
+            for value_name, data_key in (("ProductName", "OSVersion"), ("CurrentBuild", "OSBuild")):
+                try:
+                    value, _ = winreg.QueryValueEx(key, value_name)
+                except OSError:
                     continue
-                name = item.get("Name", "").lower().strip()
-                version = item.get("Version", "")
-                publisher = item.get("Publisher")
-                if name and version and name not in installed:
-                    installed[name] = InstalledItem(name=item.get("Name", ""), version=version, publisher=publisher)
+                if value:
+                    data[data_key] = str(value)
+    except OSError:
+        pass
+    return data
+
+
+def _query_serial_number(powershell: str) -> str | None:
+    script = "(Get-CimInstance Win32_BIOS -OperationTimeoutSec 5).SerialNumber"
+    try:
+        result = subprocess.run([powershell, *_PS_ARGS, script], capture_output=True, text=True, check=False, timeout=10)
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    except subprocess.TimeoutExpired:
+        pass
+    return None
+
+
+def get_hp_system_info(*, powershell: str = "powershell") -> HPSystemInfo:
+    registry_data = _read_registry_system_data()
+    if registry_data.get("Manufacturer") and registry_data.get("Model") and registry_data.get("OSVersion"):
+        info = _parse_hp_system_info(registry_data)
+        if info.manufacturer and shutil.which(powershell):
+            info.serial_number = _query_serial_number(powershell)
+        return info
+    info = HPSystemInfo()
+    if not shutil.which(powershell):
+        return info
+    script = f"{_PS_UTF8_PREAMBLE}\n{_PS_SYSTEM_BODY}\n$result | ConvertTo-Json -Compress"
+    try:
+        result = subprocess.run([powershell, *_PS_ARGS, script], capture_output=True, check=False, timeout=10)
+        if result.returncode == 0 and result.stdout:
+            info = _parse_hp_system_info(_json_loads(result.stdout))
     except (subprocess.TimeoutExpired, json.JSONDecodeError, ValueError):
         pass
-    return installed
+    return info
 
 
-def find_installed_version(driver_name: str, category: str | None, installed_cache: dict[str, InstalledItem]) -> str | None:
-    driver_lower = driver_name.lower()
-    driver_norm = _normalize_name(driver_name)
-    is_bios = bool(re.search(r"\bbios\b", driver_lower)) or (category and "bios" in category.lower())
-    if is_bios:
-        bios_item = installed_cache.get("system bios")
-        if bios_item and bios_item.version:
-            return bios_item.version
-    search_terms: list[str] = []
+_SNAPSHOT_TTL_ENV = "AIO_SNAPSHOT_CACHE_TTL"
+_SNAPSHOT_TTL_DEFAULT = 300.0
+_SNAPSHOT_REGISTRY_KEYS = (
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"HARDWARE\DESCRIPTION\System\BIOS",
+)
+
+
+def _snapshot_cache_path() -> Path:
+    return get_application_directory() / "cache" / "system_snapshot.json"
+
+
+def _snapshot_registry_stamps() -> list[int]:
+    """Last-write times of the registry keys the snapshot is derived from."""
+    if winreg is None:
+        return []
+    stamps: list[int] = []
+    for key_path in _SNAPSHOT_REGISTRY_KEYS:
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                stamps.append(winreg.QueryInfoKey(key)[2])
+        except OSError:
+            stamps.append(0)
+    return stamps
+
+
+def _read_snapshot_cache(cache_path: Path, ttl: float, stamps: list[int]) -> tuple[HPSystemInfo, dict[str, InstalledItem]] | None:
+    try:
+        payload = _json_loads(cache_path.read_bytes())
+        if time.time() - float(payload["ts"]) >= ttl:
+            return None
+        if payload.get("stamps") != stamps:
+            return None
+        info = HPSystemInfo(**payload["system"])
+        installed = {
+            key: InstalledItem(**value) for key, value in payload["installed"].items()
+        }
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+    return info, installed
+
+
+def _write_snapshot_cache(cache_path: Path, stamps: list[int], info: HPSystemInfo, installed: dict[str, InstalledItem]) -> None:
+    payload = {
+        "ts": time.time(),
+        "stamps": stamps,
+        "system": asdict(info),
+        "installed": {key: asdict(item) for key, item in installed.items()},
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(payload), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def collect_system_snapshot(
+    *, powershell: str = "powershell", cache_ttl: float | None = None
+) -> tuple[HPSystemInfo, dict[str, InstalledItem]]:
+    """Gather system info and the installed-software dump in one PowerShell session.
+
+    Spawning powershell.exe dominates the cost of both queries, so a full
+    scan runs this once instead of paying the interpreter start-up per query.
+    Results are cached on disk for a short TTL (AIO_SNAPSHOT_CACHE_TTL, in
+    seconds) and invalidated when the Uninstall or BIOS registry keys change,
+    so re-scans within a session skip PowerShell entirely.
+    """
+    if cache_ttl is None:
+        try:
+            cache_ttl = float(os.getenv(_SNAPSHOT_TTL_ENV, _SNAPSHOT_TTL_DEFAULT))
+        except ValueError:
+            cache_ttl = _SNAPSHOT_TTL_DEFAULT
+    cache_path = _snapshot_cache_path()
+    stamps = _snapshot_registry_stamps()
+    if cache_ttl > 0:
+        cached = _read_snapshot_cache(cache_path, cache_ttl, stamps)
+        if cached is not None:
+            return cached
+    info = HPSystemInfo()
+    installed: dict[str, InstalledItem] = {}
+    if not shutil.which(powershell):
+        return info, installed
+    script = (
+        f"{_PS_UTF8_PREAMBLE}\n{_PS_SYSTEM_BODY}\n{_PS_INSTALLED_BODY}\n"
+        "@{ System = $result; Installed = $items } | ConvertTo-Json -Depth 3 -Compress"
+    )
+    try:
+        result = subprocess.run([powershell, *_PS_ARGS, script], capture_output=True, check=False, timeout=40)
+        if result.returncode == 0 and result.stdout:
+            data = _json_loads(result.stdout)
+            info = _parse_hp_system_info(data.get("System") or {})
+            installed = _parse_installed_items(data.get("Installed") or [])
+            if cache_ttl > 0 and (info.manufacturer or installed):
+                _write_snapshot_cache(cache_path, stamps, info, installed)
+    except (subprocess.TimeoutExpired, json.JSONDecodeError, ValueError):
+        pass
+    return info, installed
+
+
+_INSTALLED_INDEX_TTL = 5.0
+_installed_index_cache: tuple[float, InstalledIndex] | None = None
+
+
+def get_installed_drivers_and_software(*, powershell: str = "powershell") -> InstalledIndex:
+    """Installed drivers/software as an InstalledIndex.
+
+    The index is built in the same pass that parses the PowerShell dump, so
+    names are normalized exactly once; its dict-compatible view keeps
+    callers that expect {lowercased name: InstalledItem} working. A snapshot
+    taken within the last few seconds is reused so scan backends invoked
+    back-to-back share one inventory enumeration.
+    """
+    global _installed_index_cache
+    if _installed_index_cache is not None:
+        stamp, cached = _installed_index_cache
+        if time.monotonic() - stamp <= _INSTALLED_INDEX_TTL:
+            return cached
+    if not shutil.which(powershell):
+        return InstalledIndex({})
+    script = (
+        f"{_PS_UTF8_PREAMBLE}\n{_PS_INSTALLED_BODY}\n"
+        "$items | ForEach-Object { $_ | ConvertTo-Json -Depth 2 -Compress }"
+    )
+    installed: dict[str, InstalledItem] = {}
+    try:
+        proc = subprocess.Popen(
+            [powershell, *_PS_ARGS, script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            line = line.strip().lstrip(b"\xef\xbb\xbf")
+            if not line:
+                continue
+            try:
+                _add_installed_item(installed, _json_loads(line))
+            except ValueError:
+                continue
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    except OSError:
+        return InstalledIndex({})
+    index = InstalledIndex(installed)
+    if installed:
+        _installed_index_cache = (time.monotonic(), index)
+    return index
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_search_terms(driver_lower: str) -> frozenset[str]:
+    """Deduplicated search terms implied by a lowercased driver name."""
+    search_terms: set[str] = set()
     if "intel" in driver_lower:
-        search_terms.append("intel")
+        search_terms.add("intel")
     if "realtek" in driver_lower:
-        search_terms.append("realtek")
+        search_terms.add("realtek")
     if "nvidia" in driver_lower:
-        search_terms.append("nvidia")
+        search_terms.add("nvidia")
     if "amd" in driver_lower:
-        search_terms.append("amd")
+        search_terms.add("amd")
     if "bluetooth" in driver_lower:
-        search_terms.append("bluetooth")
-    if re.search(r"wireless|wlan|wifi|wi-fi", driver_lower):
-        search_terms.extend(["wireless", "wlan", "wifi"])
-    if re.search(r"graphics|video|display", driver_lower):
-        search_terms.extend(["graphics", "video", "display"])
-    if re.search(r"audio|sound", driver_lower):
-        search_terms.extend(["audio", "sound"])
-    if re.search(r"ethernet|nic|network", driver_lower):
-        search_terms.extend(["ethernet", "network"])
+        search_terms.add("bluetooth")
+    if _RE_WIRELESS.search(driver_lower):
+        search_terms.update(("wireless", "wlan", "wifi"))
+    if _RE_GRAPHICS.search(driver_lower):
+        search_terms.update(("graphics", "video", "display"))
+    if _RE_AUDIO.search(driver_lower):
+        search_terms.update(("audio", "sound"))
+    if _RE_ETHERNET.search(driver_lower):
+        search_terms.update(("ethernet", "network"))
     if "chipset" in driver_lower:
-        search_terms.append("chipset")
-    if re.search(r"storage|raid|rst|rapid", driver_lower):
-        search_terms.extend(["storage", "rapid", "rst"])
+        search_terms.add("chipset")
+    if _RE_STORAGE.search(driver_lower):
+        search_terms.update(("storage", "rapid", "rst"))
     if "bios" in driver_lower:
-        search_terms.append("bios")
+        search_terms.add("bios")
     if "firmware" in driver_lower:
-        search_terms.append("firmware")
-    if re.search(r"management engine|me driver", driver_lower):
-        search_terms.append("management engine")
+        search_terms.add("firmware")
+    if _RE_MGMT_ENGINE.search(driver_lower):
+        search_terms.add("management engine")
     if "thunderbolt" in driver_lower:
-        search_terms.append("thunderbolt")
-    if re.search(r"serial io|serialio", driver_lower):
-        search_terms.append("serial")
-    if re.search(r"arc|a380|a770", driver_lower):
-        search_terms.append("arc")
+        search_terms.add("thunderbolt")
+    if _RE_SERIAL_IO.search(driver_lower):
+        search_terms.add("serial")
+    if _RE_ARC.search(driver_lower):
+        search_terms.add("arc")
     if "usb 3" in driver_lower:
-        search_terms.append("usb 3")
-    is_wireless_driver = bool(re.search(r"\b(wlan|wifi|wireless)\b", driver_norm))
+        search_terms.add("usb 3")
+    return frozenset(search_terms)
+
+
+def find_installed_version(
+    driver_name: str,
+    category: str | None,
+    installed_cache: dict[str, InstalledItem] | InstalledIndex,
+) -> str | None:
+    index = installed_cache if isinstance(installed_cache, InstalledIndex) else InstalledIndex(installed_cache)
+    driver_lower = driver_name.lower()
+    driver_norm = _normalize_name(driver_name)
+    is_bios = bool(_RE_BIOS.search(driver_lower)) or (category and "bios" in category.lower())
+    if is_bios:
+        bios_item = index.get("system bios")
+        if bios_item and bios_item.version:
+            return bios_item.version
+    is_wireless_driver = bool(_RE_WLAN_WORD.search(driver_norm))
+    exact = index.by_norm.get(driver_norm)
+    if exact and exact.version:
+        return exact.version
+    driver_tokens = frozenset(driver_norm.split())
+    if len(driver_tokens) >= 2:
+        shared_counts: dict[int, int] = {}
+        for token in driver_tokens:
+            for idx_hit in index.by_token.get(token, ()):
+                shared_counts[idx_hit] = shared_counts.get(idx_hit, 0) + 1
+        for idx_hit in sorted(i for i, count in shared_counts.items() if count >= 2):
+            item_norm = index.norms[idx_hit]
+            if is_bios and not _RE_BIOS.search(item_norm):
+                continue
+            if is_wireless_driver and "manageability" in item_norm and "manageability" not in driver_norm:
+                continue
+            if driver_norm in item_norm or item_norm in driver_norm:
+                item = index.records[idx_hit]
+                if item.version:
+                    return item.version
+    search_terms = _build_search_terms(driver_lower)
+    probe_words = {term.split()[0] for term in search_terms}
+    cat_lower = category.lower() if category else ""
+    for cat_key, words in _CATEGORY_PROBE_WORDS.items():
+        if cat_key in cat_lower:
+            probe_words.update(words)
+    cat_searches: list[Callable[[str], object]] = []
+    if "graphics" in cat_lower:
+        cat_searches.append(_RE_CAT_GRAPHICS.search)
+    if "audio" in cat_lower:
+        cat_searches.append(_RE_CAT_AUDIO.search)
+    if "network" in cat_lower:
+        cat_searches.append(_RE_CAT_NETWORK.search)
+    if "chipset" in cat_lower:
+        cat_searches.append(_RE_CAT_CHIPSET.search)
+    if "storage" in cat_lower:
+        cat_searches.append(_RE_CAT_STORAGE.search)
+    if "bios" in cat_lower:
+        cat_searches.append(_RE_BIOS.search)
+    elif "firmware" in cat_lower:
+        cat_searches.append(_RE_FIRMWARE.search)
+    search_terms_tuple = tuple(search_terms)
+    check_manageability = is_wireless_driver and "manageability" not in driver_norm
+    bios_search = _RE_BIOS.search
+    norms = index.norms
+    records = index.records
     best_match: InstalledItem | None = None
     best_score = 0
-    for item_name, item_data in installed_cache.items():
-        item_norm = _normalize_name(item_name)
-        if is_bios and not re.search(r"\bbios\b", item_norm):
+    for idx in index.candidates(probe_words):
+        item_norm = norms[idx]
+        if is_bios and not bios_search(item_norm):
             continue
-        if is_wireless_driver and "manageability" in item_norm and "manageability" not in driver_norm:
+        if check_manageability and "manageability" in item_norm:
             continue
-        score = 0
-        for term in search_terms:
-            if term in item_norm:
-                score += 1
-        if category:
-            cat_lower = category.lower()
-            if "graphics" in cat_lower and re.search(r"graphics|display|video", item_norm):
-                score += 2
-            if "audio" in cat_lower and re.search(r"audio|sound|realtek", item_norm):
-                score += 2
-            if "network" in cat_lower and re.search(r"network|ethernet|wireless|wifi|bluetooth", item_norm):
-                score += 2
-            if "chipset" in cat_lower and re.search(r"chipset|serial|management|usb", item_norm):
-                score += 2
-            if "storage" in cat_lower and re.search(r"storage|rapid|rst|raid|optane", item_norm):
-                score += 2
-            if "bios" in cat_lower and re.search(r"\bbios\b", item_norm):
-                score += 2
-            elif "firmware" in cat_lower and re.search(r"firmware", item_norm):
-                score += 2
+        score = sum(1 for term in search_terms_tuple if term in item_norm)
+        score += sum(2 for search in cat_searches if search(item_norm))
         if score > best_score:
             best_score = score
-            best_match = item_data
+            best_match = records[idx]
     if best_match and best_score >= 2:
         return best_match.version
     return None
 
 
-def get_driver_status(driver_name: str, category: str | None, available_version: str | None, installed_cache: dict[str, InstalledItem]) -> tuple[str, str | None]:
+def get_driver_status(
+    driver_name: str,
+    category: str | None,
+    available_version: str | None,
+    installed_cache: dict[str, InstalledItem] | InstalledIndex,
+) -> tuple[str, str | None]:
     installed_ver = find_installed_version(driver_name, category, installed_cache)
     if not installed_ver:
         return ("Not Installed", None)
@@ -382,20 +793,76 @@ class SubprocessRunner:
         return subprocess.run(command, capture_output=True, text=True, check=False)
 
 
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+_DOWNLOAD_ERRORS: tuple[type[Exception], ...] = (urllib.error.URLError,)
+if requests is not None:
+    _DOWNLOAD_ERRORS = _DOWNLOAD_ERRORS + (requests.RequestException,)
+_http_session = None
+
+
+def _get_http_session():
+    """Shared keep-alive session so multi-file downloads reuse connections."""
+    global _http_session
+    if _http_session is None and requests is not None:
+        _http_session = requests.Session()
+        _http_session.headers["User-Agent"] = "Mozilla/5.0"
+    return _http_session
+
+
 def _download_file(url: str, destination: Path) -> None:
-    request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
     destination.parent.mkdir(parents=True, exist_ok=True)
     temp_path = destination.with_suffix(destination.suffix + ".download")
+    session = _get_http_session()
     try:
-        with urllib.request.urlopen(request, timeout=60) as response, temp_path.open("wb") as handle:
-            shutil.copyfileobj(response, handle)
+        if session is not None:
+            with session.get(url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                with temp_path.open("wb") as handle:
+                    for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                        handle.write(chunk)
+        else:
+            request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+            with urllib.request.urlopen(request, timeout=60) as response, temp_path.open("wb") as handle:
+                while chunk := response.read(_DOWNLOAD_CHUNK_SIZE):
+                    handle.write(chunk)
         temp_path.replace(destination)
-    except urllib.error.URLError as exc:
+    except _DOWNLOAD_ERRORS as exc:
         if temp_path.exists():
             temp_path.unlink()
         raise RuntimeError(f"Download failed for {url}: {exc}") from exc
 
 
+def _find_first(root: Path, *, name: str | None = None, suffix: str | None = None, max_depth: int = 6) -> Path | None:
+    """Breadth-first search for the first file matching name or suffix.
+
+    rglob keeps walking the whole subtree; an extracted HPIA directory can
+    hold thousands of unpacked files, so a bounded scandir walk that stops
+    on the first hit is much cheaper. Matching is case-insensitive to
+    mirror Windows filesystem semantics.
+    """
+    target = name.casefold() if name else None
+    ending = suffix.casefold() if suffix else None
+    queue: deque[tuple[Path, int]] = deque([(root, 0)])
+    while queue:
+        directory, depth = queue.popleft()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if depth < max_depth:
+                                queue.append((Path(entry.path), depth + 1))
+                            continue
+                    except OSError:
+                        continue
+                    entry_name = entry.name.casefold()
+                    if (target and entry_name == target) or (ending and entry_name.endswith(ending)):
+                        return Path(entry.path)
+        except OSError:
+            continue
+    return None
+
+
 class HPIAClient:
     def __init__(
         self,
@@ -414,6 +881,11 @@ class HPIAClient:
             "HPIA_DOWNLOAD_URL",
             "https://hpia.hpcloud.hp.com/downloads/hpia/hp-hpia-5.2.1.exe",
         )
+        self._installed_index: InstalledIndex | None = None
+
+    def attach_installed_index(self, index: InstalledIndex | None) -> None:
+        """Share a prebuilt installed-software index with subsequent scans."""
+        self._installed_index = index
 
     def is_available(self) -> bool:
         return self._executable is not None and self._executable.exists()
@@ -423,7 +895,7 @@ class HPIAClient:
             return True
         hpia_dir = self._working_dir / "HPIA"
         hpia_dir.mkdir(parents=True, exist_ok=True)
-        existing = next(hpia_dir.rglob("HPImageAssistant.exe"), None)
+        existing = _find_first(hpia_dir, name="HPImageAssistant.exe")
         if existing:
             self._executable = existing
             return True
@@ -453,7 +925,7 @@ class HPIAClient:
                     self._executable = refreshed
                     return True
             raise
-        extracted = next(hpia_dir.rglob("HPImageAssistant.exe"), None)
+        extracted = _find_first(hpia_dir, name="HPImageAssistant.exe")
         if extracted:
             self._executable = extracted
             return True
@@ -464,7 +936,7 @@ class HPIAClient:
                 return True
         return False
 
-    def scan(self) -> list[DriverRecord]:
+    def scan(self, installed: dict[str, InstalledItem] | InstalledIndex | None = None) -> list[DriverRecord]:
         exe = self._require_executable()
         if self._report_dir.exists():
             shutil.rmtree(self._report_dir)
@@ -481,12 +953,15 @@ class HPIAClient:
         result = self._runner.run(args)
         if result.returncode != 0:
             raise RuntimeError(f"HPIA scan failed: {result.stderr}")
-        report_file = next(self._report_dir.rglob("*.json"), None)
+        report_file = _find_first(self._report_dir, suffix=".json")
         if not report_file:
             return []
-        data = json.loads(report_file.read_text(encoding="utf-8"))
-        recommendations = data.get("HPIA", {}).get("Recommendations", [])
-        installed_cache = get_installed_drivers_and_software()
+        recommendations = self._read_recommendations(report_file)
+        if installed is None:
+            installed = self._installed_index
+        if installed is None:
+            installed = get_installed_drivers_and_software()
+        installed_cache = installed if isinstance(installed, InstalledIndex) else InstalledIndex(installed)
         records: list[DriverRecord] = []
         for rec in recommendations:
             rec_value = rec.get("RecommendationValue", "Optional")
@@ -543,6 +1018,22 @@ class HPIAClient:
                 mapping[spid] = candidate
         return mapping
 
+    def _read_recommendations(self, report_file: Path) -> Iterable[dict]:
+        """Yield the Recommendations array without materializing large reports.
+
+        HPIA reports carry verbose per-softpaq metadata; above the streaming
+        threshold ijson walks straight to HPIA.Recommendations instead of
+        building the whole document.
+        """
+        if ijson is not None and report_file.stat().st_size > _HPIA_STREAM_THRESHOLD:
+            def _stream() -> Iterable[dict]:
+                with report_file.open("rb") as handle:
+                    yield from ijson.items(handle, "HPIA.Recommendations.item")
+
+            return _stream()
+        data = _json_loads(report_file.read_bytes())
+        return data.get("HPIA", {}).get("Recommendations", [])
+
     def _auto_detect(self) -> Path | None:
         candidates = [
             Path("C:/Program Files/HP/HPIA/HPImageAssistant.exe"),
@@ -599,6 +1090,9 @@ class HPIAClient:
         return self._executable  # type: ignore[return-value]
 
 
+_CMSL_CATEGORY_TOKENS = ("driver", "bios", "firmware")
+
+
 class CMSLClient:
     def __init__(
         self,
@@ -608,11 +1102,20 @@ class CMSLClient:
     ) -> None:
         self._powershell = powershell
         self._runner = command_runner or SubprocessRunner()
+        self._installed_index: InstalledIndex | None = None
+
+    def attach_installed_index(self, index: InstalledIndex | None) -> None:
+        """Share a prebuilt installed-software index with subsequent scans."""
+        self._installed_index = index
 
     def is_available(self) -> bool:
         return shutil.which(self._powershell) is not None
 
-    def scan(self, platform_id: str | None) -> list[DriverRecord]:
+    def scan(
+        self,
+        platform_id: str | None,
+        installed: dict[str, InstalledItem] | InstalledIndex | None = None,
+    ) -> list[DriverRecord]:
         if not platform_id:
             return []
         script = (
@@ -620,22 +1123,24 @@ class CMSLClient:
             f"$sp = Get-SoftpaqList -Platform '{platform_id}' -Os Win11 -OsVer 24H2 -ErrorAction Stop; "
             "$sp | ConvertTo-Json -Depth 4"
         )
-        result = self._runner.run([self._powershell, "-NoProfile", "-Command", script])
+        result = self._runner.run([self._powershell, *_PS_ARGS, script])
         if result.returncode != 0 or not result.stdout:
             return []
-        try:
-            data = json.loads(result.stdout)
-        except json.JSONDecodeError:
+        data = _parse_ps_json(result.stdout)
+        if not data:
             return []
-        installed_cache = get_installed_drivers_and_software()
+        if installed is None:
+            installed = self._installed_index
+        if installed is None:
+            installed = get_installed_drivers_and_software()
+        installed_cache = installed if isinstance(installed, InstalledIndex) else InstalledIndex(installed)
         records: list[DriverRecord] = []
-        if isinstance(data, dict):
-            data = [data]
-        for item in data or []:
+        for item in data:
             if not isinstance(item, dict):
                 continue
             category = item.get("Category", "")
-            if "driver" not in category.lower() and "bios" not in category.lower() and "firmware" not in category.lower():
+            cat_lower = category.lower()
+            if not any(token in cat_lower for token in _CMSL_CATEGORY_TOKENS):
                 continue
             driver_name = item.get("Name", "Unknown")
             available_ver = item.get("Version")
@@ -662,21 +1167,19 @@ class CMSLClient:
             f"$sp = Get-SoftpaqList -Platform '{platform_id}' -Os Win11 -OsVer 24H2 -ErrorAction Stop; "
             "$sp | ConvertTo-Json -Depth 4"
         )
-        result = self._runner.run([self._powershell, "-NoProfile", "-Command", script])
+        result = self._runner.run([self._powershell, *_PS_ARGS, script])
         if result.returncode != 0 or not result.stdout:
             return []
-        try:
-            data = json.loads(result.stdout)
-        except json.JSONDecodeError:
+        data = _parse_ps_json(result.stdout)
+        if not data:
             return []
-        if isinstance(data, dict):
-            data = [data]
         records: list[DriverRecord] = []
-        for item in data or []:
+        for item in data:
             if not isinstance(item, dict):
                 continue
             category = item.get("Category", "")
-            if "driver" not in category.lower() and "bios" not in category.lower() and "firmware" not in category.lower():
+            cat_lower = category.lower()
+            if not any(token in cat_lower for token in _CMSL_CATEGORY_TOKENS):
                 continue
             bucket = _categorize_cmsl(category, item.get("Name", ""))
             records.append(
@@ -699,7 +1202,7 @@ class CMSLClient:
             "Import-Module HPCMSL -ErrorAction Stop; "
             f"Get-Softpaq -Number {softpaq_id} -SaveAs '{destination}' -Overwrite -ErrorAction Stop"
         )
-        result = self._runner.run([self._powershell, "-NoProfile", "-Command", script])
+        result = self._runner.run([self._powershell, *_PS_ARGS, script])
         if result.returncode != 0:
             raise RuntimeError(f"CMSL download failed for {softpaq_id}: {result.stderr}")
         return destination
@@ -719,16 +1222,54 @@ class DriverService:
         self._runner = command_runner or SubprocessRunner()
         self._hpia = hpia_client or HPIAClient(self._working_dir)
         self._cmsl = cmsl_client or CMSLClient()
-        self._system_info_provider = system_info_provider or get_hp_system_info
+        self._system_info_provider = system_info_provider
         self.last_scan_warnings: list[str] = []
         self.last_system_info: HPSystemInfo | None = None
-
-    def scan(self) -> list[DriverRecord]:
-        info = self._system_info_provider()
+        self._info_cache: tuple[float, HPSystemInfo, dict[str, InstalledItem] | None] | None = None
+
+    def _collect_info(self) -> tuple[HPSystemInfo, dict[str, InstalledItem] | None]:
+        """System info plus, when using the default provider, the installed dump.
+
+        An injected provider only knows how to produce HPSystemInfo, so the
+        installed cache is left to the scan clients in that case.
+        """
+        if self._system_info_provider is not None:
+            return self._system_info_provider(), None
+        return collect_system_snapshot()
+
+    _SYSTEM_INFO_TTL = 30.0
+
+    def _prepare_scan(self) -> tuple[HPSystemInfo, dict[str, InstalledItem] | None]:
+        """Shared scan prolog: cached system info and fresh warning state.
+
+        The board and model cannot change mid-session, so back-to-back scans
+        reuse one probe for a short window instead of re-querying hardware.
+        """
+        if self._info_cache is not None:
+            stamp, info, installed = self._info_cache
+            if time.monotonic() - stamp <= self._SYSTEM_INFO_TTL:
+                self.last_system_info = info
+                self.last_scan_warnings = []
+                return info, installed
+        info, installed = self._collect_info()
+        self._info_cache = (time.monotonic(), info, installed)
         self.last_system_info = info
         self.last_scan_warnings = []
+        return info, installed
+
+    def scan(self) -> list[DriverRecord]:
+        # The system snapshot and the HPIA availability probe are independent
+        # I/O; overlap them so the scan starts after the slower of the two.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            info_future = pool.submit(self._prepare_scan)
+            ready_future = pool.submit(self._hpia.is_available)
+            info, installed = info_future.result()
+            hpia_ready = ready_future.result()
+        installed_index = InstalledIndex(installed) if installed is not None else None
+        if installed_index is not None:
+            self._hpia.attach_installed_index(installed_index)
+            self._cmsl.attach_installed_index(installed_index)
         records: list[DriverRecord] = []
-        hpia_ready = self._hpia.is_available()
         attempted_hpia = False
         auto_download_failed = False
         if not hpia_ready and (info.supports_hpia or info.manufacturer or info.model or info.platform_id):
@@ -738,33 +1279,46 @@ class DriverService:
             except Exception as exc:
                 auto_download_failed = True
                 self.last_scan_warnings.append(f"HPIA auto-download failed: {exc}")
-        if hpia_ready:
-            try:
-                records.extend(self._hpia.scan())
-            except Exception as exc:
-                self.last_scan_warnings.append(f"HPIA scan failed: {exc}")
-        elif info.supports_hpia or info.manufacturer or info.model or info.platform_id:
+        if not hpia_ready and (info.supports_hpia or info.manufacturer or info.model or info.platform_id):
             if not auto_download_failed:
                 message = "HPIA not found after auto-download attempt."
                 if not attempted_hpia:
                     message = "HPIA not found. Install HP Image Assistant or place HPImageAssistant.exe in the working directory."
                 self.last_scan_warnings.append(message)
-        if info.supports_cmsl:
-            if self._cmsl.is_available():
-                try:
-                    records.extend(self._cmsl.scan(info.platform_id))
-                except Exception as exc:
-                    self.last_scan_warnings.append(f"CMSL scan failed: {exc}")
-            else:
-                self.last_scan_warnings.append("CMSL not available. Install the HPCMSL PowerShell module.")
+        cmsl_ready = info.supports_cmsl and self._cmsl.is_available()
+        if info.supports_cmsl and not cmsl_ready:
+            self.last_scan_warnings.append("CMSL not available. Install the HPCMSL PowerShell module.")
+        hpia_future = cmsl_future = None
+        if hpia_ready or cmsl_ready:
+            # The two scans drive independent external processes; overlap them
+            # so wall-clock time is the slower of the two, not their sum.
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                if hpia_ready:
+                    hpia_future = pool.submit(self._hpia.scan)
+                if cmsl_ready:
+                    cmsl_future = pool.submit(self._cmsl.scan, info.platform_id)
+                if hpia_future is not None:
+                    try:
+                        records.extend(hpia_future.result())
+                    except Exception as exc:
+                        self.last_scan_warnings.append(f"HPIA scan failed: {exc}")
+                if cmsl_future is not None:
+                    try:
+                        records.extend(cmsl_future.result())
+                    except Exception as exc:
+                        self.last_scan_warnings.append(f"CMSL scan failed: {exc}")
         return records
 
     def scan_hpia(self) -> list[DriverRecord]:
-        info = self._system_info_provider()
-        self.last_system_info = info
-        self.last_scan_warnings = []
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            info_future = pool.submit(self._prepare_scan)
+            ready_future = pool.submit(self._hpia.is_available)
+            info, installed = info_future.result()
+            hpia_ready = ready_future.result()
+        installed_index = InstalledIndex(installed) if installed is not None else None
+        if installed_index is not None:
+            self._hpia.attach_installed_index(installed_index)
         records: list[DriverRecord] = []
-        hpia_ready = self._hpia.is_available()
         attempted_hpia = False
         auto_download_failed = False
         if not hpia_ready and (info.supports_hpia or info.manufacturer or info.model or info.platform_id):
@@ -788,9 +1342,7 @@ class DriverService:
         return records
 
     def scan_cmsl_catalog(self) -> list[DriverRecord]:
-        info = self._system_info_provider()
-        self.last_system_info = info
-        self.last_scan_warnings = []
+        info, _ = self._prepare_scan()
         if not info.supports_cmsl:
             self.last_scan_warnings.append("CMSL not supported on this system/OS.")
             return []
@@ -822,8 +1374,15 @@ class DriverService:
             if progress_callback:
                 progress_callback(completed, total, message)
 
-        hpia_targets = [r for r in record_list if r.source == "HPIA" and r.softpaq_id]
-        cmsl_targets = [r for r in record_list if r.source == "CMSL" and r.softpaq_id]
+        hpia_targets: list[DriverRecord] = []
+        cmsl_targets: list[DriverRecord] = []
+        for record in record_list:
+            if not record.softpaq_id:
+                continue
+            if record.source == "HPIA":
+                hpia_targets.append(record)
+            elif record.source == "CMSL":
+                cmsl_targets.append(record)
 
         if hpia_targets:
             try:
@@ -840,15 +1399,27 @@ class DriverService:
                     ops.append(DriverOperationResult(record, "download", False, str(exc)))
                     _emit(f"Failed: {record.name}")
 
-        for record in cmsl_targets:
-            try:
-                dest = self._working_dir / "cmsl_softpaqs" / f"{record.softpaq_id}.exe"
-                record.output_path = self._cmsl.download(record.softpaq_id or "", dest)
-                ops.append(DriverOperationResult(record, "download", True, "Downloaded"))
-                _emit(f"Downloaded: {record.name}")
-            except Exception as exc:
-                ops.append(DriverOperationResult(record, "download", False, str(exc)))
-                _emit(f"Failed: {record.name}")
+        if cmsl_targets:
+            cmsl_dest = self._working_dir / "cmsl_softpaqs"
+            cmsl_dest.mkdir(parents=True, exist_ok=True)
+
+            # Each CMSL download is its own PowerShell process and network
+            # fetch; overlap them. Results are consumed on this thread as they
+            # finish, so ops and the progress counter need no locking.
+            def _fetch(record: DriverRecord) -> Path:
+                return self._cmsl.download(record.softpaq_id or "", cmsl_dest / f"{record.softpaq_id}.exe")
+
+            with ThreadPoolExecutor(max_workers=min(8, len(cmsl_targets))) as pool:
+                futures = {pool.submit(_fetch, record): record for record in cmsl_targets}
+                for future in as_completed(futures):
+                    record = futures[future]
+                    try:
+                        record.output_path = future.result()
+                        ops.append(DriverOperationResult(record, "download", True, "Downloaded"))
+                        _emit(f"Downloaded: {record.name}")
+                    except Exception as exc:
+                        ops.append(DriverOperationResult(record, "download", False, str(exc)))
+                        _emit(f"Failed: {record.name}")
 
         return ops
 
@@ -869,15 +1440,37 @@ class DriverService:
             if progress_callback:
                 progress_callback(completed, total, message)
 
+        parallel_records: list[DriverRecord] = []
+        serial_records: list[DriverRecord] = []
         for record in record_list:
             if not record.output_path:
                 ops.append(DriverOperationResult(record, "install", False, "No installer downloaded"))
                 _emit(f"Skipped: {record.name}")
                 continue
-            cmd = [str(record.output_path), "/s"]
-            result = self._runner.run(cmd)
+            cat_lower = (record.category or "").lower()
+            if "bios" in cat_lower or "firmware" in cat_lower:
+                serial_records.append(record)
+            else:
+                parallel_records.append(record)
+
+        def _run_one(record: DriverRecord) -> DriverOperationResult:
+            result = self._runner.run([str(record.output_path), "/s"])
             success = result.returncode in {0, 3010}
             message = "Installed" if success else f"Installer exit {result.returncode}"
-            ops.append(DriverOperationResult(record, "install", success, message))
-            _emit(f"{message}: {record.name}")
+            return DriverOperationResult(record, "install", success, message)
+
+        if parallel_records:
+            # Independent device installers (network, audio, graphics) can run
+            # side by side; results are consumed on this thread as they finish.
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = {pool.submit(_run_one, record): record for record in parallel_records}
+                for future in as_completed(futures):
+                    op = future.result()
+                    ops.append(op)
+                    _emit(f"{op.message}: {op.driver.name}")
+        # BIOS and firmware flashes must not race other installers.
+        for record in serial_records:
+            op = _run_one(record)
+            ops.append(op)
+            _emit(f"{op.message}: {op.driver.name}")
         return ops
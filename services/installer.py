@@ -1,6 +1,9 @@
 """Application installation orchestration."""
 from __future__ import annotations
 
+import fnmatch
+import functools
+import gzip
 import http.cookiejar
 import os
 import re
@@ -13,6 +16,7 @@ import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Iterable, Mapping, Protocol, Sequence
@@ -38,10 +42,82 @@ class WingetError(RuntimeError):
     pass
 
 
+def _drain_pipe(pipe, parts: list[str]) -> None:
+    try:
+        for line in pipe:
+            parts.append(line)
+    except Exception:
+        pass
+
+
+def _wait_or_kill(proc: subprocess.Popen, timeout: float | None) -> None:
+    """Wait for a child, escalating terminate -> kill if it outlives timeout."""
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def _run_streamed(
+    cmd: Sequence[str],
+    *,
+    cwd: Path | None = None,
+    capture: bool = True,
+    capture_stdout: bool = True,
+    timeout: float | None = None,
+) -> CommandExecutionResult:
+    """Run a command, draining stdout/stderr incrementally.
+
+    Reader threads consume each pipe line by line, so a chatty installer can
+    never fill a pipe buffer and stall, and the parent holds lines instead of
+    one giant blocking buffer. With capture off the child writes straight to
+    the null device and no copying happens at all. A timeout bounds how long
+    a wedged installer can hang the batch.
+    """
+    if not capture:
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _wait_or_kill(proc, timeout)
+        return CommandExecutionResult(cmd, proc.returncode or 0, "", "")
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=-1,
+    )
+    stdout_parts: list[str] = []
+    stderr_parts: list[str] = []
+    readers = [threading.Thread(target=_drain_pipe, args=(proc.stderr, stderr_parts), daemon=True)]
+    if capture_stdout:
+        readers.append(threading.Thread(target=_drain_pipe, args=(proc.stdout, stdout_parts), daemon=True))
+    for reader in readers:
+        reader.start()
+    _wait_or_kill(proc, timeout)
+    for reader in readers:
+        reader.join(timeout=5)
+    return CommandExecutionResult(cmd, proc.returncode or 0, "".join(stdout_parts), "".join(stderr_parts))
+
+
+# A wedged msiexec or winget should fail the app, not hang the whole batch.
+_INSTALLER_TIMEOUT = 3600.0
+
+
+# The WindowsApps probe is slow (ACL-restricted directory); remember the
+# answer so repeated WingetClient construction pays it once per process.
+_WINGET_FALLBACK_UNSET = object()
+_winget_fallback_cache: object = _WINGET_FALLBACK_UNSET
+
+
 class WingetClient:
     """Thin wrapper around the winget CLI."""
 
-    VERSION_PATTERN = re.compile(r"Version\s*:\s*(.+)", re.IGNORECASE)
+    VERSION_PATTERN = re.compile(r"^\s*Version\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
 
     def __init__(self, executable: str | None = None):
         exe_path = executable or shutil.which("winget")
@@ -102,11 +178,8 @@ class WingetClient:
         result = self._run(cmd)
         if result.returncode != 0:
             return None
-        for line in result.stdout.splitlines():
-            match = self.VERSION_PATTERN.search(line)
-            if match:
-                return match.group(1).strip()
-        return None
+        match = self.VERSION_PATTERN.search(result.stdout)
+        return match.group(1).strip() if match else None
 
     def update_sources(self, name: str | None = None) -> CommandExecutionResult | None:
         if not self._executable:
@@ -128,16 +201,23 @@ class WingetClient:
         cmd = [str(self._executable), verb, "--id", package_id, "--exact"]
         if force and verb != "download":
             cmd.append("--force")
-        cmd.extend(["--accept-package-agreements", "--accept-source-agreements"])
+        cmd.extend(["--accept-package-agreements", "--accept-source-agreements", "--disable-interactivity"])
         if source:
             cmd.extend(["--source", source])
         return cmd
 
-    def _run(self, cmd: list[str]) -> CommandExecutionResult:
-        completed = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        return CommandExecutionResult(cmd, completed.returncode, completed.stdout, completed.stderr)
+    def _run(self, cmd: list[str], *, capture: bool = True) -> CommandExecutionResult:
+        return _run_streamed(cmd, capture=capture, timeout=_INSTALLER_TIMEOUT)
 
     def _find_winget_fallback(self) -> Path | None:
+        global _winget_fallback_cache
+        if _winget_fallback_cache is not _WINGET_FALLBACK_UNSET:
+            return _winget_fallback_cache
+        _winget_fallback_cache = self._locate_winget_fallback()
+        return _winget_fallback_cache
+
+    @staticmethod
+    def _locate_winget_fallback() -> Path | None:
         local_appdata = os.environ.get("LOCALAPPDATA")
         if local_appdata:
             candidate = Path(local_appdata) / "Microsoft" / "WindowsApps" / "winget.exe"
@@ -147,12 +227,15 @@ class WingetClient:
         if program_files:
             base = Path(program_files) / "WindowsApps"
             try:
-                candidates = base.glob("Microsoft.DesktopAppInstaller_*_x64__8wekyb3d8bbwe/winget.exe")
+                with os.scandir(base) as entries:
+                    for entry in entries:
+                        if not fnmatch.fnmatchcase(entry.name, "Microsoft.DesktopAppInstaller_*_x64__8wekyb3d8bbwe"):
+                            continue
+                        candidate = Path(entry.path) / "winget.exe"
+                        if candidate.exists():
+                            return candidate
             except OSError:
-                candidates = []
-            for candidate in candidates:
-                if candidate.exists():
-                    return candidate
+                pass
         return None
 
 
@@ -314,8 +397,7 @@ class OfficeInstaller:
         config_path.write_text(template_xml, encoding="utf-8")
         self.ensure_setup(app_name)
         cmd = [str(self.setup_executable(app_name)), "/configure", str(config_path)]
-        completed = subprocess.run(cmd, capture_output=True, text=True, check=False, cwd=office_dir)
-        return CommandExecutionResult(cmd, completed.returncode, completed.stdout, completed.stderr)
+        return _run_streamed(cmd, cwd=office_dir)
 
     def download(self, app_name: str, *, status_callback: Callable[[str], None] | None = None) -> CommandExecutionResult:
         if not self._template_loader:
@@ -394,6 +476,11 @@ class ConfiguredUrlDownloader:
         return DirectDownloadInfo(version=self._version, url=url, filename=filename)
 
 
+# Scraped pages are small; a read cap keeps a misbehaving server from
+# ballooning memory.
+_HTML_READ_LIMIT = 2_000_000
+
+
 class IVMSDownloader:
     """Scrapes Hikvision's site for the latest iVMS-4200 build."""
 
@@ -432,16 +519,34 @@ class IVMSDownloader:
         url = self._build_url(version)
         return DirectDownloadInfo(version=version, url=url)
 
+    # url -> (etag, html); lets repeat fetches validate with If-None-Match
+    # instead of re-downloading the page.
+    _page_cache: dict[str, tuple[str, str]] = {}
+
     def _fetch_html(self, url: str) -> str:
-        request = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120",
-                "Accept-Language": "en-US,en;q=0.9",
-            },
-        )
-        with urllib.request.urlopen(request, timeout=20) as response:
-            return response.read().decode("utf-8", errors="ignore")
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept-Encoding": "gzip",
+        }
+        cached = self._page_cache.get(url)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=20) as response:
+                raw = response.read(_HTML_READ_LIMIT)
+                if (response.headers.get("Content-Encoding") or "").lower() == "gzip":
+                    raw = gzip.decompress(raw)
+                html = raw.decode("utf-8", errors="ignore")
+                etag = response.headers.get("ETag")
+                if etag:
+                    self._page_cache[url] = (etag, html)
+                return html
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304 and cached:
+                return cached[1]
+            raise
 
     def _build_url(self, version: str) -> str:
         dash = "v" + version.replace(".", "-")
@@ -494,7 +599,7 @@ class HPSADownloader:
     def fetch(self) -> DirectDownloadInfo:
         request = urllib.request.Request(self.SOURCE_URL, headers={"User-Agent": "Mozilla/5.0"})
         with urllib.request.urlopen(request, timeout=20) as response:
-            content = response.read().decode("utf-8", errors="ignore")
+            content = response.read(_HTML_READ_LIMIT).decode("utf-8", errors="ignore")
         for line in content.splitlines():
             trimmed = line.strip()
             if not trimmed or trimmed.startswith("//"):
@@ -523,6 +628,26 @@ class OperationResult:
     stderr: str = ""
 
 
+_BATCH_WORKERS = 4
+
+# Installer processes that cannot safely overlap share a lock per family:
+# msiexec and most EXE installers take machine-wide mutexes, and winget
+# serializes its own operations anyway.
+_INSTALL_FAMILY_LOCKS: dict[str, threading.Lock] = {
+    "office": threading.Lock(),
+    "winget": threading.Lock(),
+    "local": threading.Lock(),
+}
+
+
+def _install_family(app: AppEntry) -> str:
+    if app.download_mode == "office":
+        return "office"
+    if app.download_mode in {"winget", "onlineonly"}:
+        return "winget"
+    return "local"
+
+
 class InstallerService:
     def __init__(
         self,
@@ -560,6 +685,8 @@ class InstallerService:
             )
         if direct_downloaders:
             self._direct_downloaders.update(direct_downloaders)
+        self._sources_primed = False
+        self._local_info_cache: dict[tuple[str, bool], tuple[tuple[int, ...], LocalInstallerInfo]] = {}
 
     def is_downloadable(self, app: AppEntry) -> bool:
         if app.download_mode in {"localonly", "onlineonly"}:
@@ -571,6 +698,38 @@ class InstallerService:
         return True
 
     def get_local_installer_info(self, app: AppEntry, *, include_downloads: bool = True) -> LocalInstallerInfo:
+        cache_key = (app.name, include_downloads)
+        token = self._local_dirs_token(app)
+        cached = self._local_info_cache.get(cache_key)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+        info = self._locate_local_installer(app, include_downloads=include_downloads)
+        self._local_info_cache[cache_key] = (token, info)
+        return info
+
+    def _local_dirs_token(self, app: AppEntry) -> tuple[int, ...]:
+        """Freshness token for the memo: mtimes of the scanned directories.
+
+        Adding, removing or renaming an installer bumps the owning
+        directory's mtime, so stale entries invalidate themselves.
+        """
+        token: list[int] = []
+        for directory in (
+            self._working_dir,
+            self._downloads_dir,
+            self._downloads_dir / _safe_name(app.name),
+        ):
+            try:
+                token.append(directory.stat().st_mtime_ns)
+            except OSError:
+                token.append(-1)
+        return tuple(token)
+
+    def _invalidate_local_info(self, app: AppEntry) -> None:
+        self._local_info_cache.pop((app.name, True), None)
+        self._local_info_cache.pop((app.name, False), None)
+
+    def _locate_local_installer(self, app: AppEntry, *, include_downloads: bool) -> LocalInstallerInfo:
         if app.installer_path:
             candidate = Path(app.installer_path)
             if candidate.exists() and candidate.is_file():
@@ -645,16 +804,18 @@ class InstallerService:
         progress_callback: Callable[[int, int, str], None] | None = None,
         status_callback: Callable[[str], None] | None = None,
     ) -> list[OperationResult]:
-        results: list[OperationResult] = []
         apps = list(self._selected_apps(selection))
-        total = len(apps)
-        for index, app in enumerate(apps, start=1):
-            if status_callback:
-                status_callback(app.name)
-            results.append(self._install_app(app))
-            if progress_callback:
-                progress_callback(index, total, app.name)
-        return results
+
+        def _install_one(app: AppEntry) -> OperationResult:
+            with _INSTALL_FAMILY_LOCKS[_install_family(app)]:
+                return self._install_app(app)
+
+        return self._run_batch(
+            apps,
+            _install_one,
+            progress_callback=progress_callback,
+            status_callback=status_callback,
+        )
 
     def download_selected(
         self,
@@ -664,18 +825,76 @@ class InstallerService:
         status_callback: Callable[[str], None] | None = None,
         force_updates: Iterable[str] | None = None,
     ) -> list[OperationResult]:
-        results: list[OperationResult] = []
         apps = list(self._selected_apps(selection))
-        total = len(apps)
         force_set = {name.lower() for name in force_updates or []}
-        for index, app in enumerate(apps, start=1):
+
+        def _download_one(app: AppEntry) -> OperationResult:
+            force_update = app.name.lower() in force_set
+            result = self._download_app(app, status_callback=status_callback, force_update=force_update)
+            if result.success:
+                self._invalidate_local_info(app)
+            return result
+
+        return self._run_batch(
+            apps,
+            _download_one,
+            progress_callback=progress_callback,
+            status_callback=status_callback,
+        )
+
+    def _prime_winget(self, apps: Sequence[AppEntry]) -> None:
+        """Refresh winget source metadata once so per-package calls skip it."""
+        if self._sources_primed:
+            return
+        if not any(app.download_mode in {"winget", "onlineonly"} for app in apps):
+            return
+        if not self._winget.is_available():
+            return
+        try:
+            self._winget.update_sources()
+        except Exception:
+            pass
+        self._sources_primed = True
+
+    def _run_batch(
+        self,
+        apps: Sequence[AppEntry],
+        worker: Callable[[AppEntry], OperationResult],
+        *,
+        progress_callback: Callable[[int, int, str], None] | None,
+        status_callback: Callable[[str], None] | None,
+    ) -> list[OperationResult]:
+        """Dispatch per-app work to a thread pool, preserving selection order.
+
+        The per-app work is dominated by network and subprocess waits, so a
+        few threads hide most of the latency. Progress is reported as apps
+        complete; results come back in the order the apps were selected.
+        """
+        total = len(apps)
+        if not total:
+            return []
+        self._prime_winget(apps)
+        self._local_info_cache.clear()
+        results: list[OperationResult | None] = [None] * total
+        progress_lock = threading.Lock()
+        completed = 0
+
+        def _run_one(index: int, app: AppEntry) -> None:
+            nonlocal completed
             if status_callback:
                 status_callback(app.name)
-            force_update = app.name.lower() in force_set
-            results.append(self._download_app(app, status_callback=status_callback, force_update=force_update))
+            result = worker(app)
+            results[index] = result
             if progress_callback:
-                progress_callback(index, total, app.name)
-        return results
+                with progress_lock:
+                    completed += 1
+                    progress_callback(completed, total, app.name)
+
+        with ThreadPoolExecutor(max_workers=min(_BATCH_WORKERS, total)) as pool:
+            futures = [pool.submit(_run_one, index, app) for index, app in enumerate(apps)]
+            for future in futures:
+                future.result()
+        return [result for result in results if result is not None]
 
     def local_version_override_warnings(self, app: AppEntry) -> list[str]:
         if not app.winget_version or not app.winget_version.strip():
@@ -763,6 +982,7 @@ class InstallerService:
             download_result = self._download_direct(app)
             if not download_result.success:
                 return OperationResult(app, "install", False, download_result.message, download_result.stdout, download_result.stderr)
+            self._invalidate_local_info(app)
             local_info = self.get_local_installer_info(app, include_downloads=True)
             if local_info.exists:
                 result = self._install_from_local(app, local_info)
@@ -812,25 +1032,32 @@ class InstallerService:
             return OperationResult(app, "install", False, "No Winget package id configured")
         if not self._winget.is_available():
             return OperationResult(app, "install", False, "winget executable not found")
-        stdout_parts: list[str] = []
-        stderr_parts: list[str] = []
-        success = True
         version = app.winget_version.strip() if app.winget_version else None
-        for package_id in package_ids:
-            try:
-                result = self._winget.install_package(
-                    package_id,
-                    source=app.source,
-                    override=app.args or None,
-                    version=version,
-                )
-            except WingetError as exc:
-                return OperationResult(app, "install", False, str(exc))
-            stdout_parts.append(result.stdout)
-            stderr_parts.append(result.stderr)
-            success = success and result.succeeded
+
+        def _install_one(package_id: str) -> CommandExecutionResult:
+            return self._winget.install_package(
+                package_id,
+                source=app.source,
+                override=app.args or None,
+                version=version,
+            )
+
+        try:
+            # Dual-arch legs run sequentially: winget installs drive msiexec,
+            # and concurrent Windows Installer sessions fail with error 1618.
+            results = [_install_one(package_id) for package_id in package_ids]
+        except WingetError as exc:
+            return OperationResult(app, "install", False, str(exc))
+        success = all(result.succeeded for result in results)
         message = "Installed via winget" if success else "winget install failed"
-        return OperationResult(app, "install", success, message, "\n".join(stdout_parts), "\n".join(stderr_parts))
+        return OperationResult(
+            app,
+            "install",
+            success,
+            message,
+            "\n".join(result.stdout for result in results),
+            "\n".join(result.stderr for result in results),
+        )
 
     def _download_via_winget(
         self,
@@ -863,81 +1090,121 @@ class InstallerService:
         elif app.winget_id:
             stem = app.file_stem or _safe_name(app.name)
             packages.append((app.winget_id, stem))
-        for package_id, stem in packages:
-            if version_override:
-                version_raw = version_override
-            else:
-                try:
-                    version_raw = self._winget.show_package_version(package_id, source=app.source)
-                except WingetError as exc:
-                    success = False
-                    messages.append(f"{stem}: {exc}")
-                    continue
-            version = _normalize_version_string(version_raw) or version_raw or "unknown"
-            safe_version = _safe_file_part(version)
-            existing = self._find_existing_versioned_file(target_root, stem, safe_version)
-            if existing:
-                messages.append(f"{stem}: already have {existing.name}")
-                continue
-            temp_dir = target_root / f"temp_{_safe_name(stem)}"
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            monitor = _start_speed_monitor(temp_dir, app.name, status_callback)
-            try:
-                result = self._winget.download_package(
-                    package_id,
-                    destination=temp_dir,
-                    source=app.source,
-                    version=version_override,
+        if len(packages) > 1:
+            # Each package downloads into its own temp dir, so the x86 and
+            # x64 legs can fetch concurrently.
+            with ThreadPoolExecutor(max_workers=len(packages)) as pool:
+                futures = [
+                    pool.submit(
+                        self._download_one_winget_package,
+                        app,
+                        package_id,
+                        stem,
+                        target_root,
+                        version_override,
+                        status_callback,
+                    )
+                    for package_id, stem in packages
+                ]
+                outcomes = [future.result() for future in futures]
+        else:
+            outcomes = [
+                self._download_one_winget_package(
+                    app, package_id, stem, target_root, version_override, status_callback
                 )
+                for package_id, stem in packages
+            ]
+        for ok, item_message, stdout, stderr in outcomes:
+            success = success and ok
+            messages.append(item_message)
+            if stdout:
+                stdout_parts.append(stdout)
+            if stderr:
+                stderr_parts.append(stderr)
+        message = "; ".join(messages) if messages else "No packages downloaded"
+        return OperationResult(app, "download", success, message, "\n".join(stdout_parts), "\n".join(stderr_parts))
+
+    def _download_one_winget_package(
+        self,
+        app: AppEntry,
+        package_id: str,
+        stem: str,
+        target_root: Path,
+        version_override: str | None,
+        status_callback: Callable[[str], None] | None,
+    ) -> tuple[bool, str, str, str]:
+        """Fetch one winget package; returns (ok, message, stdout, stderr)."""
+        if version_override:
+            version_raw = version_override
+        else:
+            try:
+                version_raw = self._winget.show_package_version(package_id, source=app.source)
             except WingetError as exc:
-                success = False
-                messages.append(f"{stem}: {exc}")
-                continue
-            finally:
-                _stop_speed_monitor(monitor)
-            stdout_parts.append(result.stdout)
-            stderr_parts.append(result.stderr)
-            if not result.succeeded:
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                error_msg = result.stderr.strip() or result.stdout.strip() or f"download failed (exit code {result.returncode})"
-                fallback_path = None
-                if app.name == "Chrome" and _winget_hash_mismatch(error_msg):
-                    try:
-                        fallback_path = self._download_chrome_direct(
-                            target_root,
-                            stem,
-                            safe_version,
-                            status_callback=status_callback,
-                        )
-                    except Exception as exc:
-                        success = False
-                        messages.append(f"{stem}: {error_msg}; direct download failed ({exc})")
-                        continue
-                if fallback_path:
-                    messages.append(f"{stem}: winget hash mismatch; downloaded {fallback_path.name} direct")
-                else:
-                    success = False
-                    messages.append(f"{stem}: {error_msg}")
-                continue
-            installer = self._find_downloaded_installer(temp_dir)
-            if not installer:
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                success = False
-                messages.append(f"{stem}: installer not found after download")
-                continue
-            dest_path = target_root / f"{stem}_{safe_version}{installer.suffix.lower()}"
+                return (False, f"{stem}: {exc}", "", "")
+        version = _normalize_version_string(version_raw) or version_raw or "unknown"
+        safe_version = _safe_file_part(version)
+        existing = self._find_existing_versioned_file(target_root, stem, safe_version)
+        if existing:
+            return (True, f"{stem}: already have {existing.name}", "", "")
+        temp_dir = target_root / f"temp_{_safe_name(stem)}"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        monitor = _start_speed_monitor(temp_dir, app.name, status_callback)
+        try:
+            result = self._winget.download_package(
+                package_id,
+                destination=temp_dir,
+                source=app.source,
+                version=version_override,
+            )
+        except WingetError as exc:
+            return (False, f"{stem}: {exc}", "", "")
+        finally:
+            _stop_speed_monitor(monitor)
+        if not result.succeeded:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            error_msg = result.stderr.strip() or result.stdout.strip() or f"download failed (exit code {result.returncode})"
+            fallback_path = None
+            if app.name == "Chrome" and _winget_hash_mismatch(error_msg):
+                try:
+                    fallback_path = self._download_chrome_direct(
+                        target_root,
+                        stem,
+                        safe_version,
+                        status_callback=status_callback,
+                    )
+                except Exception as exc:
+                    return (
+                        False,
+                        f"{stem}: {error_msg}; direct download failed ({exc})",
+                        result.stdout,
+                        result.stderr,
+                    )
+            if fallback_path:
+                return (
+                    True,
+                    f"{stem}: winget hash mismatch; downloaded {fallback_path.name} direct",
+                    result.stdout,
+                    result.stderr,
+                )
+            return (False, f"{stem}: {error_msg}", result.stdout, result.stderr)
+        installer = self._find_downloaded_installer(temp_dir)
+        if not installer:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return (False, f"{stem}: installer not found after download", result.stdout, result.stderr)
+        dest_path = target_root / f"{stem}_{safe_version}{installer.suffix.lower()}"
+        try:
+            # Same volume (both under the downloads dir), so this is a single
+            # atomic rename; shutil.move only as a cross-volume fallback.
             try:
+                os.replace(installer, dest_path)
+            except OSError:
                 shutil.move(str(installer), dest_path)
-            except OSError as exc:
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                success = False
-                messages.append(f"{stem}: rename failed ({exc})")
-                continue
+        except OSError as exc:
             shutil.rmtree(temp_dir, ignore_errors=True)
-            _remove_versioned_files(target_root, stem, keep_name=dest_path.name)
-            messages.append(f"{stem}: downloaded {dest_path.name}")
-        message = "; ".join(messages) if messages else "No packages downloaded"
-        return OperationResult(app, "download", success, message, "\n".join(stdout_parts), "\n".join(stderr_parts))
+            return (False, f"{stem}: rename failed ({exc})", result.stdout, result.stderr)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        _remove_versioned_files(target_root, stem, keep_name=dest_path.name)
+        return (True, f"{stem}: downloaded {dest_path.name}", result.stdout, result.stderr)
 
     def _download_direct(
         self,
@@ -1022,14 +1289,14 @@ class InstallerService:
     ) -> Path | None:
         candidates: list[Path] = []
         for directory in search_dirs:
-            if not directory.exists():
+            names = _dir_listing(directory)
+            if not names:
                 continue
             for pattern in patterns:
-                candidates.extend(directory.glob(pattern))
+                candidates.extend(directory / name for name in fnmatch.filter(names, pattern))
             for name in exact_names:
-                candidate = directory / name
-                if candidate.exists():
-                    candidates.append(candidate)
+                if name in names:
+                    candidates.append(directory / name)
         return _pick_best_candidate(candidates)
 
     def _find_existing_versioned_file(self, target_root: Path, stem: str, version: str) -> Path | None:
@@ -1043,9 +1310,11 @@ class InstallerService:
     def _find_downloaded_installer(self, temp_dir: Path) -> Path | None:
         if not temp_dir.exists():
             return None
-        for candidate in sorted(temp_dir.rglob("*")):
-            if candidate.is_file() and candidate.suffix.lower() in {".exe", ".msi"}:
-                return candidate
+        for root, dirs, files in os.walk(temp_dir):
+            dirs.sort()
+            matches = [name for name in files if name[-4:].lower() in {".exe", ".msi"}]
+            if matches:
+                return Path(root) / min(matches, key=str.lower)
         return None
 
     def _package_ids_for(self, app: AppEntry) -> list[str]:
@@ -1067,7 +1336,9 @@ class InstallerService:
             cmd = [str(path)]
         if app.args:
             cmd.extend(shlex.split(app.args))
-        completed = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        # Installers spew progress noise on stdout that nothing reads; only
+        # stderr is kept for the failure message. verbose_output opts back in.
+        completed = _run_streamed(cmd, capture_stdout=app.verbose_output, timeout=_INSTALLER_TIMEOUT)
         success = completed.returncode == 0
         message = "Local install completed" if success else "Local install failed"
         return OperationResult(app, "install", success, message, completed.stdout, completed.stderr)
@@ -1122,6 +1393,29 @@ def _download_file_with_final_url(
             opener.open(urllib.request.Request(referer, headers=headers), timeout=20).read(1)
         except Exception:
             pass
+    # Download to a .part file and rename on success so an interrupted
+    # transfer never leaves a truncated installer at the final name.
+    temp_path = destination.with_name(destination.name + ".part")
+    try:
+        final_url = _stream_to_file(request, opener, temp_path, status_callback=status_callback, label=label)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+    os.replace(temp_path, destination)
+    return final_url
+
+
+def _stream_to_file(
+    request: urllib.request.Request,
+    opener: urllib.request.OpenerDirector,
+    destination: Path,
+    *,
+    status_callback: Callable[[str], None] | None,
+    label: str | None,
+) -> str:
     with opener.open(request, timeout=60) as response, destination.open("wb") as handle:
         final_url = response.geturl()
         last_time = time.monotonic() - 0.5
@@ -1324,17 +1618,26 @@ def _download_sharepoint_exe(
     )
 
 
+_VER2_RE = re.compile(r"^\d+\.\d+$")
+_VER3_RE = re.compile(r"^\d+\.\d+\.\d+$")
+_VER4_RE = re.compile(r"^\d+\.\d+\.\d+\.\d+$")
+_VER_EXTRACT_RE = re.compile(r"(\d+\.\d+(?:\.\d+){0,2})")
+_VER_IN_FILENAME_RE = re.compile(r"_([0-9]+(?:\.[0-9]+){1,3})\.(exe|msi)$", re.IGNORECASE)
+_SAFE_PART_RE = re.compile(r"[^a-zA-Z0-9._-]")
+_SAFE_NAME_RE = re.compile(r"[^a-zA-Z0-9_-]+")
+
+
 def _normalize_version_string(value: str | None) -> str | None:
     if not value or not value.strip():
         return None
     cleaned = value.strip()
-    if re.match(r"^\d+\.\d+$", cleaned):
+    if _VER2_RE.match(cleaned):
         return f"{cleaned}.0.0"
-    if re.match(r"^\d+\.\d+\.\d+$", cleaned):
+    if _VER3_RE.match(cleaned):
         return f"{cleaned}.0"
-    if re.match(r"^\d+\.\d+\.\d+\.\d+$", cleaned):
+    if _VER4_RE.match(cleaned):
         return cleaned
-    match = re.search(r"(\d+\.\d+(?:\.\d+){0,2})", cleaned)
+    match = _VER_EXTRACT_RE.search(cleaned)
     if match:
         return _normalize_version_string(match.group(1))
     return cleaned
@@ -1349,9 +1652,10 @@ def _version_tuple(version: str | None) -> tuple[int, ...]:
     return tuple(int(part) for part in parts)
 
 
+@functools.lru_cache(maxsize=256)
 def _safe_file_part(value: str) -> str:
     cleaned = value.strip().replace(" ", "_")
-    cleaned = re.sub(r"[^a-zA-Z0-9._-]", "", cleaned)
+    cleaned = _SAFE_PART_RE.sub("", cleaned)
     return cleaned or "unknown"
 
 
@@ -1361,7 +1665,7 @@ def _winget_hash_mismatch(message: str) -> bool:
 
 
 def _extract_version_from_filename(filename: str) -> str | None:
-    match = re.search(r"_([0-9]+(?:\.[0-9]+){1,3})\.(exe|msi)$", filename, re.IGNORECASE)
+    match = _VER_IN_FILENAME_RE.search(filename)
     if match:
         return _normalize_version_string(match.group(1))
     return None
@@ -1429,6 +1733,29 @@ def _get_file_version(path: Path) -> str | None:
     return f"{major}.{minor}.{build}.{revision}"
 
 
+@functools.lru_cache(maxsize=128)
+def _cached_dir_listing(path: str, mtime_ns: int) -> tuple[str, ...]:
+    try:
+        with os.scandir(path) as entries:
+            return tuple(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        return ()
+
+
+def _dir_listing(directory: Path) -> tuple[str, ...]:
+    """File names in a directory, cached against its modification time.
+
+    One scandir pass replaces a glob sweep per pattern, and the mtime key
+    means repeated lookups across an app batch reuse the listing while new
+    downloads (which touch the directory) invalidate it naturally.
+    """
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except OSError:
+        return ()
+    return _cached_dir_listing(str(directory), mtime_ns)
+
+
 def _pick_best_candidate(files: Sequence[Path]) -> Path | None:
     best: Path | None = None
     best_version: tuple[int, ...] | None = None
@@ -1485,12 +1812,16 @@ def _remove_installers_in_dir(target_root: Path) -> None:
             continue
 
 
+@functools.lru_cache(maxsize=512)
 def _safe_name(name: str) -> str:
-    return re.sub(r"[^a-zA-Z0-9_-]+", "_", name).lower()
+    return _SAFE_NAME_RE.sub("_", name).lower()
+
+
+_IS_64BIT = sys.maxsize > 2**32
 
 
 def _is_64bit() -> bool:
-    return sys.maxsize > 2**32
+    return _IS_64BIT
 
 
 def _chrome_download_url() -> str:
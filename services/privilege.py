@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import ctypes
+import functools
+import subprocess
 import sys
 
 
@@ -9,7 +11,10 @@ _MB_OK = 0x00000000
 _MB_ICONWARNING = 0x00000030
 
 
+@functools.lru_cache(maxsize=1)
 def is_admin() -> bool:
+    # The process token cannot change after startup; elevation relaunches a
+    # new process, so the first answer stays valid for the process lifetime.
     try:
         return bool(ctypes.windll.shell32.IsUserAnAdmin())
     except AttributeError:
@@ -19,12 +24,13 @@ def is_admin() -> bool:
 def relaunch_as_admin() -> bool:
     if not sys.platform.startswith("win"):
         return False
+    executable = sys.executable
+    # list2cmdline is the exact inverse of CommandLineToArgvW, so arguments
+    # with embedded quotes, backslashes, or spaces round-trip correctly.
     if getattr(sys, "frozen", False):
-        executable = sys.executable
-        params = " ".join(f'"{arg}"' for arg in sys.argv[1:])
+        params = subprocess.list2cmdline(sys.argv[1:])
     else:
-        executable = sys.executable
-        params = " ".join(f'"{arg}"' for arg in sys.argv)
+        params = subprocess.list2cmdline(sys.argv)
     result = ctypes.windll.shell32.ShellExecuteW(None, "runas", executable, params, None, 1)
     return result > 32
 
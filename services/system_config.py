@@ -1,11 +1,17 @@
 """System configuration logic (timezone, locale, power, icons)."""
 from __future__ import annotations
 
+import functools
+import json
+import os
 import re
 import shlex
 import subprocess
 import tempfile
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from pathlib import Path
@@ -22,11 +28,15 @@ DEFAULT_USER_HIVE_KEY = "AIO_DefaultUser"
 DEFAULT_USER_HIVE_PATH = r"C:\Users\Default\NTUSER.DAT"
 HKCU_PREFIX = "HKCU:\\"
 POWERCFG_GUID_PATTERN = re.compile(r"Power Scheme GUID:\s*([0-9a-fA-F-]{36})\s*\((.*?)\)\s*(\*)?")
+POWERCFG_LINE_PREFIX = "Power Scheme GUID:"
 KNOWN_POWER_SCHEMES = {
     "SCHEME_BALANCED": "381b4222-f694-41f0-9685-ff5bb260df2e",
     "SCHEME_MIN": "a1841308-3541-4fab-bc81-f71556f20b4a",
     "SCHEME_MAX": "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c",
+    # High Performance plan as deployed by ConfigMgr images
+    "SCHEME_MAX_CONFIGMGR": "db310065-829b-4671-9647-2261c00e86ef",
 }
+_GUID_CHARS = b"-0123456789abcdefABCDEF"
 DESKTOP_POLICY_PATH = r"HKCU:\Software\Microsoft\Windows\CurrentVersion\Policies\Explorer"
 DESKTOP_POLICY_VALUE = "NoDesktop"
 DESKTOP_ICON_VISIBILITY_PATHS = (
@@ -67,12 +77,56 @@ LANGUAGE_CAPABILITY_PREFIXES = {
     "ar-SA": ("Language.Basic", "Language.Handwriting", "Language.OCR", "Language.TextToSpeech"),
 }
 TARGET_HOME_GEO_ID = 244
+INTL_REG_PATH = r"HKCU:\Control Panel\International"
+_LOCALE_SETTINGS_SCRIPT_TEMPLATE = "; ".join(
+    (
+        "Set-WinSystemLocale -SystemLocale {locale}",
+        f"Set-WinHomeLocation -GeoId {TARGET_HOME_GEO_ID}",
+        "Set-WinUILanguageOverride -Language {language}",
+        "Set-Culture -CultureInfo {language}",
+        f"Set-ItemProperty -Path '{INTL_REG_PATH}' -Name 'iDate' -Value '1'",
+        f"Set-ItemProperty -Path '{INTL_REG_PATH}' -Name 'sDate' -Value '/'",
+        f"Set-ItemProperty -Path '{INTL_REG_PATH}' -Name 'sShortDate' -Value {{date}}",
+    )
+)
+_CAPABILITY_LIST_SCRIPT = (
+    "Get-WindowsCapability -Online | Select-Object Name,State | ConvertTo-Json -Compress"
+)
+_INSTALL_LANG_SCRIPT_TEMPLATE = (
+    "$cmd = Get-Command Install-Language -ErrorAction SilentlyContinue; "
+    "if ($cmd) {{ Install-Language -Language {lang} -ErrorAction Stop | Out-Null }}"
+)
+_CAPABILITY_ENSURE_SCRIPT_TEMPLATE = "; ".join(
+    (
+        "$cap = Get-WindowsCapability -Online | Where-Object {{ $_.Name -like {pattern} }} | Select-Object -First 1",
+        "if (-not $cap) {{ Write-Output 'missing'; exit 7 }}",
+        "if ($cap.State -ne 'Installed') {{ Add-WindowsCapability -Online -Name $cap.Name -ErrorAction Stop | Out-Null }}",
+        "$state = (Get-WindowsCapability -Online -Name $cap.Name).State",
+        'if ($state -ne \'Installed\') {{ Write-Output "state=$state"; exit 8 }}',
+        "Write-Output $cap.Name",
+    )
+)
+_SPEECH_PREF_SCRIPT = (
+    "Set-ItemProperty -Path 'HKCU:\\Software\\Microsoft\\Speech_OneCore\\Settings\\OnlineSpeechPrivacy'"
+    " -Name 'HasAccepted' -Value 1 -Type DWord; "
+    "Set-ItemProperty -Path 'HKCU:\\Software\\Microsoft\\Speech_OneCore\\Settings\\SpeechRecognition'"
+    " -Name 'PreferOffline' -Value 0 -Type DWord"
+)
 ARABIC_SPELLING_REG_PATH = r"HKCU:\Software\Microsoft\Spelling\Options\ar-SA"
 ARABIC_SPELLING_RULES = {
     "StrictFinalYaa": 1,
     "StrictInitialAlefHamza": 0,
     "StrictTaaMarboota": 1,
 }
+WAIT_BACKOFF_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8)
+PS_BATCH_SENTINEL_PREFIX = "===AIO/"
+LOCALE_QUERY_BLOCKS = (
+    ("locale", "Get-WinSystemLocale | Select-Object -ExpandProperty Name"),
+    ("culture", "(Get-Culture).Name"),
+    ("geo", "(Get-WinHomeLocation).GeoId"),
+    ("langs", "(Get-WinUserLanguageList).LanguageTag"),
+    ("display", "(Get-WinUILanguageOverride).Name"),
+)
 SYSTEM_CONFIG_STEP_ORDER = (
     "Timezone",
     "Power Plan",
@@ -82,10 +136,20 @@ SYSTEM_CONFIG_STEP_ORDER = (
     "Default User Profile",
     "Default Apps",
 )
+PARALLEL_APPLY_STEPS = frozenset(
+    {"Timezone", "Power Plan", "Fast Boot", "Default User Profile", "Default Apps"}
+)
 
 T = TypeVar("T")
 
 
+@dataclass(frozen=True)
+class PowercfgSnapshot:
+    schemes: tuple[tuple[str, str, bool], ...]
+    active_guid: str
+    active_name: str
+
+
 @dataclass
 class ConfigCheckResult:
     name: str
@@ -108,14 +172,179 @@ class DiagnosticStepResult:
     detail: str = ""
 
 
+class _RunCache:
+    """Memoizes read-only external command output within one check/apply pass."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, factory: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._values:
+                return self._values[key]  # type: ignore[return-value]
+        value = factory()
+        with self._lock:
+            return self._values.setdefault(key, value)  # type: ignore[return-value]
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
 class CommandRunner(Protocol):
     def run(self, command: Sequence[str]) -> subprocess.CompletedProcess[str]:  # pragma: no cover - protocol
         ...
 
 
+def _windows_spawn_kwargs() -> dict[str, object]:
+    kwargs: dict[str, object] = {}
+    if hasattr(subprocess, "CREATE_NO_WINDOW"):  # pragma: no cover - Windows only
+        # Skip console allocation for the many short-lived helper processes,
+        # and keep them from preempting foreground UI work.
+        kwargs["creationflags"] = (
+            subprocess.CREATE_NO_WINDOW | subprocess.BELOW_NORMAL_PRIORITY_CLASS
+        )
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = subprocess.SW_HIDE
+        kwargs["startupinfo"] = startupinfo
+    return kwargs
+
+
 class SubprocessRunner:
+    DEFAULT_TIMEOUT = 600.0
+
+    def __init__(self, timeout: float | None = DEFAULT_TIMEOUT) -> None:
+        self._timeout = timeout
+
+    def run(self, command: Sequence[str]) -> subprocess.CompletedProcess[str]:
+        kwargs = _windows_spawn_kwargs()
+        try:
+            return subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                check=False,
+                close_fds=True,
+                timeout=self._timeout,
+                **kwargs,  # type: ignore[arg-type]
+            )
+        except subprocess.TimeoutExpired as exc:
+            stdout = exc.stdout.decode(errors="replace") if isinstance(exc.stdout, bytes) else (exc.stdout or "")
+            stderr = exc.stderr.decode(errors="replace") if isinstance(exc.stderr, bytes) else (exc.stderr or "")
+            message = f"timed out after {self._timeout:.0f}s"
+            return subprocess.CompletedProcess(
+                list(command), 1, stdout, f"{stderr}\n{message}".strip()
+            )
+
+
+class PersistentPowerShellRunner:
+    """CommandRunner that reuses one long-lived PowerShell host.
+
+    Every ``["powershell", ..., "-Command", script]`` invocation normally pays
+    the host startup cost. This runner pipes each script into a single
+    ``powershell -Command -`` process instead, reading output up to a unique
+    sentinel line that carries the script's exit code. Non-PowerShell commands
+    (tzutil, powercfg, reg, dism) are delegated to a plain SubprocessRunner,
+    as is everything when the host cannot be started (e.g. non-Windows).
+
+    A script that terminates the host (``exit N``) is reported with the
+    host's exit code; the host is restarted lazily on the next call.
+    """
+
+    _HOST_COMMAND = ("powershell", "-NoProfile", "-NonInteractive", "-Command", "-")
+
+    def __init__(self, fallback: CommandRunner | None = None) -> None:
+        self._fallback = fallback or SubprocessRunner()
+        self._process: subprocess.Popen[str] | None = None
+        self._lock = threading.Lock()
+
     def run(self, command: Sequence[str]) -> subprocess.CompletedProcess[str]:
-        return subprocess.run(command, capture_output=True, text=True, check=False)
+        if not self._is_powershell_command(command):
+            return self._fallback.run(command)
+        with self._lock:
+            return self._run_script(list(command), command[-1])
+
+    def close(self) -> None:
+        with self._lock:
+            process = self._process
+            self._process = None
+        if process is not None and process.poll() is None:
+            try:
+                if process.stdin:
+                    process.stdin.close()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+
+    @staticmethod
+    def _is_powershell_command(command: Sequence[str]) -> bool:
+        return (
+            len(command) >= 2
+            and command[0].lower() in ("powershell", "pwsh")
+            and "-Command" in command
+            and command[-1] != "-Command"
+        )
+
+    def _ensure_host(self) -> subprocess.Popen[str] | None:
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+        try:
+            self._process = subprocess.Popen(
+                self._HOST_COMMAND,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                **_windows_spawn_kwargs(),  # type: ignore[arg-type]
+            )
+        except OSError:
+            self._process = None
+        return self._process
+
+    def _run_script(self, command: list[str], script: str) -> subprocess.CompletedProcess[str]:
+        process = self._ensure_host()
+        if process is None or process.stdin is None or process.stdout is None:
+            return self._fallback.run(command)
+        marker = uuid.uuid4().hex
+        wrapped = (
+            "$global:LASTEXITCODE = 0; $__aioOk = $true; "
+            f"try {{ {script} }} catch {{ $__aioOk = $false; $_ | Out-String | Write-Output }}; "
+            "$__aioRc = if (-not $__aioOk) { 1 } elseif ($LASTEXITCODE) { $LASTEXITCODE } else { 0 }; "
+            f"Write-Output \"{marker}:$__aioRc\""
+        )
+        try:
+            process.stdin.write(wrapped + "\n")
+            process.stdin.flush()
+        except OSError:
+            self._process = None
+            return self._fallback.run(command)
+        output_lines: list[str] = []
+        returncode = 0
+        while True:
+            line = process.stdout.readline()
+            if not line:
+                # Host terminated before echoing the sentinel (script called
+                # exit); surface its exit code and restart on next use.
+                returncode = process.wait()
+                self._process = None
+                break
+            stripped = line.rstrip("\r\n")
+            if stripped.startswith(marker + ":"):
+                try:
+                    returncode = int(stripped.split(":", 1)[1] or 0)
+                except ValueError:
+                    returncode = 0
+                break
+            output_lines.append(stripped)
+        return subprocess.CompletedProcess(command, returncode, "\n".join(output_lines), "")
 
 
 class RegistryAccessor(Protocol):
@@ -125,6 +354,13 @@ class RegistryAccessor(Protocol):
     def set_value(self, path: str, value_name: str, value: str | int) -> None:  # pragma: no cover - protocol
         ...
 
+    def get_values(self, path: str, names: Iterable[str]) -> dict[str, str | int | None]:
+        return {name: self.get_value(path, name) for name in names}
+
+    def set_values(self, path: str, items: Iterable[tuple[str, str | int]]) -> None:
+        for name, value in items:
+            self.set_value(path, name, value)
+
 
 class WindowsRegistryAccessor:
     """Minimal registry helper backed by winreg."""
@@ -148,6 +384,28 @@ class WindowsRegistryAccessor:
         with winreg.CreateKeyEx(hive, subkey) as key:  # type: ignore[arg-type]
             winreg.SetValueEx(key, value_name, 0, value_type, value)
 
+    def get_values(self, path: str, names: Iterable[str]) -> dict[str, str | int | None]:
+        hive, subkey = self._split_path(path)
+        names = tuple(names)
+        try:
+            with winreg.OpenKey(hive, subkey) as key:  # type: ignore[arg-type]
+                values: dict[str, str | int | None] = {}
+                for name in names:
+                    try:
+                        values[name], _ = winreg.QueryValueEx(key, name)
+                    except FileNotFoundError:
+                        values[name] = None
+                return values
+        except FileNotFoundError:
+            return {name: None for name in names}
+
+    def set_values(self, path: str, items: Iterable[tuple[str, str | int]]) -> None:
+        hive, subkey = self._split_path(path)
+        with winreg.CreateKeyEx(hive, subkey) as key:  # type: ignore[arg-type]
+            for name, value in items:
+                value_type = winreg.REG_DWORD if isinstance(value, int) else winreg.REG_SZ
+                winreg.SetValueEx(key, name, 0, value_type, value)
+
     def _split_path(self, path: str) -> tuple[object, str]:
         cleaned = path.replace("/", "\\")
         marker = ":\\"
@@ -178,10 +436,12 @@ class SystemConfigService:
         registry: RegistryAccessor | None = None,
     ) -> None:
         self._config = config
-        self._runner = command_runner or SubprocessRunner()
+        self._runner = command_runner or PersistentPowerShellRunner()
         self._registry = registry or WindowsRegistryAccessor()
+        self._run_cache = _RunCache()
 
     def check(self) -> list[ConfigCheckResult]:
+        self._run_cache.clear()
         results = [
             self._check_timezone(),
             self._check_power_plan(),
@@ -200,6 +460,7 @@ class SystemConfigService:
         return SYSTEM_CONFIG_STEP_ORDER
 
     def apply_with_results(self, selected_steps: Iterable[str] | None = None) -> list[ApplyStepResult]:
+        self._run_cache.clear()
         step_map: dict[str, Callable[[], ApplyStepResult]] = {
             "Timezone": self._apply_timezone,
             "Power Plan": self._apply_power_plan,
@@ -210,7 +471,27 @@ class SystemConfigService:
             "Default Apps": self._apply_default_apps,
         }
         requested = set(step_map) if selected_steps is None else {name for name in selected_steps if name in step_map}
-        return [step_map[name]() for name in SYSTEM_CONFIG_STEP_ORDER if name in requested]
+        ordered = [name for name in SYSTEM_CONFIG_STEP_ORDER if name in requested]
+        parallel = [name for name in ordered if name in PARALLEL_APPLY_STEPS]
+        results: dict[str, ApplyStepResult] = {}
+        # Locale runs first on its own: it changes PowerShell-visible defaults
+        # the other steps may observe. Desktop Icons runs last so its explorer
+        # refresh never overlaps the default-user-profile one.
+        for name in ordered:
+            if name == "Locale":
+                results[name] = step_map[name]()
+        if len(parallel) > 1:
+            with ThreadPoolExecutor(max_workers=min(4, len(parallel))) as pool:
+                futures = [(name, pool.submit(step_map[name])) for name in parallel]
+                for name, future in futures:
+                    results[name] = future.result()
+        else:
+            for name in parallel:
+                results[name] = step_map[name]()
+        for name in ordered:
+            if name not in results:
+                results[name] = step_map[name]()
+        return [results[name] for name in ordered]
 
     def diagnostics(self) -> list[DiagnosticStepResult]:
         diagnostics: list[DiagnosticStepResult] = []
@@ -229,7 +510,8 @@ class SystemConfigService:
         expected = self._config.timezone
         completed = self._runner.run(["tzutil", "/s", expected])
         detail = self._format_command_detail(completed)
-        actual = self._run_and_capture(["tzutil", "/g"])
+        self._run_cache.invalidate("tzutil_g")
+        actual = self._current_timezone()
         if actual:
             detail = f"{detail}; current: {actual}"
         success = completed.returncode == 0 and (not actual or actual == expected)
@@ -241,6 +523,7 @@ class SystemConfigService:
         target_guid, target_name = self._resolve_power_scheme(schemes)
         target = target_guid or self._config.power_plan.scheme
         completed = self._runner.run(["powercfg", "/setactive", target])
+        self._run_cache.invalidate("powercfg_snapshot")
         detail = self._format_command_detail(completed)
         if schemes:
             schemes_summary = ", ".join(
@@ -298,10 +581,7 @@ class SystemConfigService:
 
     def _apply_locale(self) -> ApplyStepResult:
         detail_parts: list[str] = []
-        command = f"Set-WinSystemLocale -SystemLocale {shlex.quote(self._config.locale.system_locale)}"
-        completed = self._runner.run(["powershell", "-NoProfile", "-Command", command])
-        detail_parts.append(f"system locale: {self._format_command_detail(completed)}")
-        success = completed.returncode == 0
+        success = True
 
         feature_success, feature_detail = self._apply_language_packs_and_features()
         success = success and feature_success
@@ -313,31 +593,27 @@ class SystemConfigService:
         if ui_detail:
             detail_parts.append(f"ui languages: {ui_detail}")
 
-        primary_language = self._primary_ui_language()
-        target_languages = self._target_language_order()
-        culture_script = "; ".join(
-            [
-                f"Set-WinHomeLocation -GeoId {TARGET_HOME_GEO_ID}",
-                f"Set-WinUILanguageOverride -Language {shlex.quote(primary_language)}",
-                f"Set-Culture -CultureInfo {shlex.quote(primary_language)}",
-                "Set-ItemProperty -Path 'HKCU:\\Control Panel\\International' -Name 'iDate' -Value '1'",
-                "Set-ItemProperty -Path 'HKCU:\\Control Panel\\International' -Name 'sDate' -Value '/'",
-                f"Set-ItemProperty -Path 'HKCU:\\Control Panel\\International' -Name 'sShortDate' -Value {shlex.quote(self._config.locale.short_date_format)}",
-            ]
+        primary_language = self._primary_ui_language
+        target_languages = self._target_language_order
+        settings_script = _LOCALE_SETTINGS_SCRIPT_TEMPLATE.format(
+            locale=shlex.quote(self._config.locale.system_locale),
+            language=shlex.quote(primary_language),
+            date=shlex.quote(self._config.locale.short_date_format),
         )
-        culture_completed = self._runner.run(["powershell", "-NoProfile", "-Command", culture_script])
-        detail_parts.append(f"culture: {self._format_command_detail(culture_completed)}")
-        success = success and culture_completed.returncode == 0
+        settings_completed = self._runner.run(["powershell", "-NoProfile", "-Command", settings_script])
+        detail_parts.append(f"locale settings: {self._format_command_detail(settings_completed)}")
+        success = success and settings_completed.returncode == 0
 
         date_error = None
         try:
-            self._registry.set_value(
-                r"HKCU:\Control Panel\International",
-                "sShortDate",
-                self._config.locale.short_date_format,
+            self._registry.set_values(
+                INTL_REG_PATH,
+                (
+                    ("sShortDate", self._config.locale.short_date_format),
+                    ("sDate", "/"),
+                    ("iDate", "1"),
+                ),
             )
-            self._registry.set_value(r"HKCU:\Control Panel\International", "sDate", "/")
-            self._registry.set_value(r"HKCU:\Control Panel\International", "iDate", "1")
         except Exception as exc:  # pragma: no cover - surfaced via UI logging
             date_error = str(exc)
             detail_parts.append(f"date: {date_error}")
@@ -353,32 +629,13 @@ class SystemConfigService:
             success = False
 
         actual_locale = self._wait_for_system_locale(self._config.locale.system_locale)
-        current_culture = self._run_and_capture(
-            [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                "(Get-Culture).Name",
-            ]
-        )
-        current_geo = self._run_and_capture(
-            [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                "(Get-WinHomeLocation).GeoId",
-            ]
-        )
-        current_lang_list = self._current_language_order()
-        date_val = self._registry.get_value(r"HKCU:\Control Panel\International", "sShortDate") or ""
-        display_language = self._run_and_capture(
-            [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                "(Get-WinUILanguageOverride).Name",
-            ]
-        )
+        self._run_cache.invalidate("locale_queries")
+        queried = self._run_locale_queries()
+        current_culture = queried.get("culture", "")
+        current_geo = queried.get("geo", "")
+        current_lang_list = _split_language_list(queried.get("langs", ""))
+        date_val = self._registry.get_value(INTL_REG_PATH, "sShortDate") or ""
+        display_language = queried.get("display", "")
         spelling_ok, spelling_actual = self._read_arabic_spelling_state()
         current_parts = [
             f"locale={actual_locale}",
@@ -410,11 +667,20 @@ class SystemConfigService:
         return ApplyStepResult("Locale", success, "; ".join(part for part in detail_parts if part))
 
     def _apply_user_profile_settings(self) -> ApplyStepResult:
+        def apply_and_check(root: str) -> tuple[ConfigCheckResult, bool]:
+            pre_state = self._check_default_user_profile_root(root)
+            if pre_state.in_desired_state:
+                return pre_state, False
+            self._apply_user_profile_settings_to_root(root)
+            return self._check_default_user_profile_root(root), True
+
         try:
-            self._apply_user_profile_settings_inner()
+            result, mutated = self._with_default_user_hive(apply_and_check)
         except Exception as exc:  # pragma: no cover - surfaced via UI logging
             return ApplyStepResult("Default User Profile", False, str(exc))
-        result = self._check_default_user_profile()
+        if not mutated:
+            # Nothing was written, so skip the disruptive explorer restart.
+            return ApplyStepResult("Default User Profile", True, f"unchanged; {result.actual}")
         refresh = self._refresh_desktop_shell()
         detail = result.actual
         if refresh:
@@ -423,9 +689,12 @@ class SystemConfigService:
 
     def _check_timezone(self) -> ConfigCheckResult:
         expected = self._config.timezone
-        actual = self._run_and_capture(["tzutil", "/g"])
+        actual = self._current_timezone()
         return ConfigCheckResult("Timezone", expected, actual, actual == expected)
 
+    def _current_timezone(self) -> str:
+        return self._run_cache.get("tzutil_g", lambda: self._run_and_capture(["tzutil", "/g"]))
+
     def _check_power_plan(self) -> ConfigCheckResult:
         expected = self._config.power_plan.friendly_name
         active_guid, active_name = self._get_active_power_scheme()
@@ -470,44 +739,17 @@ class SystemConfigService:
 
     def _check_locale(self) -> ConfigCheckResult:
         expected_locale = self._config.locale.system_locale
-        expected_display = self._primary_ui_language()
-        expected_languages = self._target_language_order()
+        expected_display = self._primary_ui_language
+        expected_languages = self._target_language_order
         expected_spelling = ", ".join(f"{name}={value}" for name, value in ARABIC_SPELLING_RULES.items())
 
-        actual_locale = self._run_and_capture(
-            [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                "Get-WinSystemLocale | Select-Object -ExpandProperty Name",
-            ]
-        )
-        actual_culture = self._run_and_capture(
-            [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                "(Get-Culture).Name",
-            ]
-        )
-        actual_geo = self._run_and_capture(
-            [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                "(Get-WinHomeLocation).GeoId",
-            ]
-        )
-        current_lang_list = self._current_language_order()
-        date_val = self._registry.get_value(r"HKCU:\Control Panel\International", "sShortDate") or ""
-        display_language = self._run_and_capture(
-            [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                "(Get-WinUILanguageOverride).Name",
-            ]
-        )
+        queried = self._run_locale_queries()
+        actual_locale = queried.get("locale", "")
+        actual_culture = queried.get("culture", "")
+        actual_geo = queried.get("geo", "")
+        current_lang_list = _split_language_list(queried.get("langs", ""))
+        date_val = self._registry.get_value(INTL_REG_PATH, "sShortDate") or ""
+        display_language = queried.get("display", "")
         spelling_ok, spelling_actual = self._read_arabic_spelling_state()
         actual_display = ", ".join(
             [
@@ -541,80 +783,95 @@ class SystemConfigService:
         return ConfigCheckResult("Locale", expected, actual_display, ok)
 
     def _check_default_user_profile(self) -> ConfigCheckResult:
-        expected_hide = int(self._config.desktop_icons.desired_value)
-        expected_date = self._config.locale.short_date_format
-        expected = f"HideIcons={expected_hide}, NoDesktop=0, sShortDate={expected_date}"
-
-        def check(root: str) -> ConfigCheckResult:
-            hide_path = self._map_user_path(self._config.desktop_icons.path, root)
-            policy_path = self._map_user_path(DESKTOP_POLICY_PATH, root)
-            date_path = self._map_user_path(r"HKCU:\Control Panel\International", root)
-            hide_val = self._registry.get_value(hide_path, self._config.desktop_icons.value_name)
-            no_desktop = self._registry.get_value(policy_path, DESKTOP_POLICY_VALUE)
-            date_val = self._registry.get_value(date_path, "sShortDate")
-            hide_str = "Not Set" if hide_val is None else str(hide_val)
-            policy_str = "Not Set" if no_desktop is None else str(no_desktop)
-            date_str = "Not Set" if date_val is None else str(date_val)
-            actual = f"HideIcons={hide_str}, NoDesktop={policy_str}, sShortDate={date_str}"
-            icons_ok = self._check_desktop_icon_registry_values(root)
-            policy_ok = True
-            if no_desktop is not None:
-                try:
-                    policy_ok = int(no_desktop) == 0
-                except (TypeError, ValueError):
-                    policy_ok = False
-            ok = (
-                hide_val == expected_hide
-                and policy_ok
-                and str(date_val).lower() == expected_date.lower()
-                and icons_ok
-            )
-            return ConfigCheckResult("Default User Profile", expected, actual, ok)
-
         try:
-            return self._with_default_user_hive(check)
+            return self._with_default_user_hive(self._check_default_user_profile_root)
         except RuntimeError as exc:
+            expected_hide = int(self._config.desktop_icons.desired_value)
+            expected_date = self._config.locale.short_date_format
+            expected = f"HideIcons={expected_hide}, NoDesktop=0, sShortDate={expected_date}"
             return ConfigCheckResult("Default User Profile", expected, str(exc), False)
 
+    def _check_default_user_profile_root(self, root: str) -> ConfigCheckResult:
+        expected_hide = int(self._config.desktop_icons.desired_value)
+        expected_date = self._config.locale.short_date_format
+        expected = f"HideIcons={expected_hide}, NoDesktop=0, sShortDate={expected_date}"
+        hide_path = self._map_user_path(self._config.desktop_icons.path, root)
+        policy_path = self._map_user_path(DESKTOP_POLICY_PATH, root)
+        date_path = self._map_user_path(INTL_REG_PATH, root)
+        hide_val = self._registry.get_value(hide_path, self._config.desktop_icons.value_name)
+        no_desktop = self._registry.get_value(policy_path, DESKTOP_POLICY_VALUE)
+        date_val = self._registry.get_value(date_path, "sShortDate")
+        hide_str = "Not Set" if hide_val is None else str(hide_val)
+        policy_str = "Not Set" if no_desktop is None else str(no_desktop)
+        date_str = "Not Set" if date_val is None else str(date_val)
+        actual = f"HideIcons={hide_str}, NoDesktop={policy_str}, sShortDate={date_str}"
+        icons_ok = self._check_desktop_icon_registry_values(root)
+        policy_ok = True
+        if no_desktop is not None:
+            try:
+                policy_ok = int(no_desktop) == 0
+            except (TypeError, ValueError):
+                policy_ok = False
+        ok = (
+            hide_val == expected_hide
+            and policy_ok
+            and str(date_val).lower() == expected_date.lower()
+            and icons_ok
+        )
+        return ConfigCheckResult("Default User Profile", expected, actual, ok)
+
     def _check_default_apps(self) -> ConfigCheckResult:
-        expected_path = str(self._default_apps_xml_path())
+        expected_path = str(self._default_apps_xml_path)
         expected = "Chrome defaults for web/file types + MAILTO mapped to Outlook classic"
         actual = self._registry.get_value(DEFAULT_APPS_POLICY_PATH, DEFAULT_APPS_POLICY_VALUE)
         actual_str = "" if actual is None else str(actual)
         ok = actual_str.strip().lower() == expected_path.lower()
         return ConfigCheckResult("Default Apps", expected, actual_str or "Not Set", ok)
 
-    def _apply_user_profile_settings_inner(self) -> None:
+    def _apply_user_profile_settings_to_root(self, root: str) -> None:
         desired = int(self._config.desktop_icons.desired_value)
-
-        def apply_to_root(root: str) -> None:
-            map_path = lambda value: self._map_user_path(value, root)
-            self._registry.set_value(
-                map_path(self._config.desktop_icons.path),
-                self._config.desktop_icons.value_name,
-                desired,
-            )
-            self._registry.set_value(map_path(DESKTOP_POLICY_PATH), DESKTOP_POLICY_VALUE, 0)
-            self._registry.set_value(
-                map_path(r"HKCU:\Control Panel\International"),
-                "sShortDate",
-                self._config.locale.short_date_format,
-            )
-            self._registry.set_value(map_path(r"HKCU:\Control Panel\International"), "sDate", "/")
-            self._registry.set_value(map_path(r"HKCU:\Control Panel\International"), "iDate", "1")
-            self._set_desktop_icon_registry_values(map_path)
-
-        self._with_default_user_hive(lambda root: apply_to_root(root))
+        map_path = lambda value: self._map_user_path(value, root)
+        self._registry.set_value(
+            map_path(self._config.desktop_icons.path),
+            self._config.desktop_icons.value_name,
+            desired,
+        )
+        self._registry.set_value(map_path(DESKTOP_POLICY_PATH), DESKTOP_POLICY_VALUE, 0)
+        self._registry.set_values(
+            map_path(INTL_REG_PATH),
+            (
+                ("sShortDate", self._config.locale.short_date_format),
+                ("sDate", "/"),
+                ("iDate", "1"),
+            ),
+        )
+        self._set_desktop_icon_registry_values(map_path)
 
     def _apply_default_apps(self) -> ApplyStepResult:
         try:
-            path = self._write_default_apps_association_file()
-            self._registry.set_value(DEFAULT_APPS_POLICY_PATH, DEFAULT_APPS_POLICY_VALUE, str(path))
+            path = self._default_apps_xml_path
+            new_xml = _build_default_apps_xml()
+            try:
+                existing_xml: bytes | None = path.read_bytes()
+            except OSError:
+                existing_xml = None
+            policy_value = self._registry.get_value(DEFAULT_APPS_POLICY_PATH, DEFAULT_APPS_POLICY_VALUE)
+            policy_ok = str(policy_value or "").strip().lower() == str(path).lower()
+            # The policy value is only written after a successful import, so
+            # matching XML plus policy implies the last DISM run succeeded.
+            if existing_xml == new_xml and policy_ok:
+                return ApplyStepResult("Default Apps", True, "unchanged")
+            self._write_default_apps_association_file(path, new_xml)
         except Exception as exc:  # pragma: no cover - surfaced via UI logging
             return ApplyStepResult("Default Apps", False, str(exc))
         command = ["dism", "/Online", f"/Import-DefaultAppAssociations:{path}"]
         completed = self._runner.run(command)
         detail = self._format_command_detail(completed)
+        if completed.returncode == 0:
+            try:
+                self._registry.set_value(DEFAULT_APPS_POLICY_PATH, DEFAULT_APPS_POLICY_VALUE, str(path))
+            except Exception as exc:  # pragma: no cover - surfaced via UI logging
+                return ApplyStepResult("Default Apps", False, f"{detail}; policy: {exc}")
         policy_value = self._registry.get_value(DEFAULT_APPS_POLICY_PATH, DEFAULT_APPS_POLICY_VALUE)
         if policy_value:
             detail = f"{detail}; policy: {policy_value}"
@@ -632,28 +889,36 @@ class SystemConfigService:
         return ", ".join(detail_parts)
 
     def _extract_power_scheme_name(self, output: str) -> str:
-        match = POWERCFG_GUID_PATTERN.search(output)
-        if match:
-            return match.group(2).strip()
+        schemes = _parse_power_schemes(output)
+        if schemes:
+            return schemes[0][1]
         if "(" in output and ")" in output:
             return output.split("(")[-1].split(")")[0].strip()
         return output.strip()
 
+    def _snapshot_powercfg(self) -> PowercfgSnapshot:
+        return self._run_cache.get("powercfg_snapshot", self._read_powercfg_snapshot)
+
+    def _read_powercfg_snapshot(self) -> PowercfgSnapshot:
+        active_guid, active_name = self._read_active_power_scheme()
+        return PowercfgSnapshot(self._read_power_scheme_list(), active_guid, active_name)
+
     def _list_power_schemes(self) -> list[tuple[str, str, bool]]:
-        output = self._run_and_capture(["powercfg", "/list"])
-        schemes: list[tuple[str, str, bool]] = []
-        for match in POWERCFG_GUID_PATTERN.finditer(output):
-            guid = match.group(1).strip()
-            name = match.group(2).strip()
-            active = bool(match.group(3))
-            schemes.append((guid, name, active))
-        return schemes
+        return list(self._snapshot_powercfg().schemes)
+
+    def _read_power_scheme_list(self) -> tuple[tuple[str, str, bool], ...]:
+        return _parse_power_schemes(self._run_and_capture(["powercfg", "/list"]))
 
     def _get_active_power_scheme(self) -> tuple[str, str]:
+        snapshot = self._snapshot_powercfg()
+        return snapshot.active_guid, snapshot.active_name
+
+    def _read_active_power_scheme(self) -> tuple[str, str]:
         output = self._run_and_capture(["powercfg", "/getactivescheme"])
-        match = POWERCFG_GUID_PATTERN.search(output)
-        if match:
-            return match.group(1).strip(), match.group(2).strip()
+        schemes = _parse_power_schemes(output)
+        if schemes:
+            guid, name, _active = schemes[0]
+            return guid, name
         return "", self._extract_power_scheme_name(output)
 
     def _resolve_power_scheme(
@@ -661,7 +926,7 @@ class SystemConfigService:
     ) -> tuple[str, str]:
         scheme = self._config.power_plan.scheme.strip()
         friendly = self._config.power_plan.friendly_name.strip()
-        if POWERCFG_GUID_PATTERN.search(f"Power Scheme GUID: {scheme} (x)"):
+        if _looks_like_guid(scheme):
             return scheme, friendly
         alias_guid = KNOWN_POWER_SCHEMES.get(scheme.upper())
         if alias_guid:
@@ -672,14 +937,14 @@ class SystemConfigService:
         return "", ""
 
     def _wait_for_active_scheme(self, target_guid: str) -> tuple[str, str]:
-        active_guid, active_name = self._get_active_power_scheme()
+        active_guid, active_name = self._read_active_power_scheme()
         if not target_guid:
             return active_guid, active_name
-        for _ in range(5):
+        for delay in WAIT_BACKOFF_DELAYS:
             if active_guid and active_guid.lower() == target_guid.lower():
                 return active_guid, active_name
-            time.sleep(0.3)
-            active_guid, active_name = self._get_active_power_scheme()
+            time.sleep(delay)
+            active_guid, active_name = self._read_active_power_scheme()
         return active_guid, active_name
 
     def _wait_for_system_locale(self, expected: str) -> str:
@@ -693,10 +958,10 @@ class SystemConfigService:
         )
         if not expected:
             return actual
-        for _ in range(5):
+        for delay in WAIT_BACKOFF_DELAYS:
             if actual and actual.lower() == expected.lower():
                 return actual
-            time.sleep(0.3)
+            time.sleep(delay)
             actual = self._run_and_capture(
                 [
                     "powershell",
@@ -730,12 +995,7 @@ class SystemConfigService:
         detail_parts: list[str] = []
         success = True
         for language in languages:
-            install_script = "; ".join(
-                [
-                    "$cmd = Get-Command Install-Language -ErrorAction SilentlyContinue",
-                    f"if ($cmd) {{ Install-Language -Language {_ps_quote(language)} -ErrorAction Stop | Out-Null }}",
-                ]
-            )
+            install_script = _INSTALL_LANG_SCRIPT_TEMPLATE.format(lang=_ps_quote(language))
             install = self._runner.run(["powershell", "-NoProfile", "-Command", install_script])
             detail_parts.append(f"{language} pack: {self._format_command_detail(install)}")
             success = success and install.returncode == 0
@@ -746,30 +1006,57 @@ class SystemConfigService:
                 detail_parts.append(capability_detail)
         return success, "language features: " + " | ".join(detail_parts)
 
+    def _windows_capabilities(self) -> tuple[tuple[str, str], ...]:
+        return self._run_cache.get("windows_capabilities", self._read_windows_capabilities)
+
+    def _read_windows_capabilities(self) -> tuple[tuple[str, str], ...]:
+        output = self._run_and_capture(["powershell", "-NoProfile", "-Command", _CAPABILITY_LIST_SCRIPT])
+        try:
+            parsed = json.loads(output)
+        except ValueError:
+            return ()
+        if isinstance(parsed, dict):
+            parsed = [parsed]
+        capabilities: list[tuple[str, str]] = []
+        for item in parsed if isinstance(parsed, list) else ():
+            if isinstance(item, dict) and item.get("Name"):
+                capabilities.append((str(item["Name"]), str(item.get("State", ""))))
+        return tuple(capabilities)
+
     def _ensure_language_capability(self, language: str, prefix: str) -> tuple[bool, str]:
-        pattern = f"{prefix}~~~{language}~*"
-        script = "; ".join(
+        capabilities = self._windows_capabilities()
+        if not capabilities:
+            # Enumeration unavailable (old PowerShell or unparseable output):
+            # fall back to the self-contained per-capability script.
+            return self._ensure_language_capability_fallback(language, prefix)
+        wanted = f"{prefix}~~~{language}~"
+        match = next((entry for entry in capabilities if entry[0].startswith(wanted)), None)
+        if match is None:
+            return False, f"{language} {prefix}: missing"
+        name, state = match
+        # ConvertTo-Json renders the DISM state enum as either its name or number.
+        if state in ("Installed", "4"):
+            return True, f"{language} {prefix}: {name} installed"
+        completed = self._runner.run(
             [
-                f"$cap = Get-WindowsCapability -Online | Where-Object {{ $_.Name -like {_ps_quote(pattern)} }} | Select-Object -First 1",
-                "if (-not $cap) { Write-Output 'missing'; exit 7 }",
-                "if ($cap.State -ne 'Installed') { Add-WindowsCapability -Online -Name $cap.Name -ErrorAction Stop | Out-Null }",
-                "$state = (Get-WindowsCapability -Online -Name $cap.Name).State",
-                "if ($state -ne 'Installed') { Write-Output \"state=$state\"; exit 8 }",
-                "Write-Output $cap.Name",
+                "powershell",
+                "-NoProfile",
+                "-Command",
+                f"Add-WindowsCapability -Online -Name {_ps_quote(name)} -ErrorAction Stop | Out-Null",
             ]
         )
+        detail = f"{language} {prefix}: {self._format_command_detail(completed)}"
+        return completed.returncode == 0, detail
+
+    def _ensure_language_capability_fallback(self, language: str, prefix: str) -> tuple[bool, str]:
+        pattern = f"{prefix}~~~{language}~*"
+        script = _CAPABILITY_ENSURE_SCRIPT_TEMPLATE.format(pattern=_ps_quote(pattern))
         completed = self._runner.run(["powershell", "-NoProfile", "-Command", script])
         detail = f"{language} {prefix}: {self._format_command_detail(completed)}"
         return completed.returncode == 0, detail
 
     def _apply_speech_preferences(self) -> str | None:
-        script = "; ".join(
-            [
-                "Set-ItemProperty -Path 'HKCU:\\Software\\Microsoft\\Speech_OneCore\\Settings\\OnlineSpeechPrivacy' -Name 'HasAccepted' -Value 1 -Type DWord",
-                "Set-ItemProperty -Path 'HKCU:\\Software\\Microsoft\\Speech_OneCore\\Settings\\SpeechRecognition' -Name 'PreferOffline' -Value 0 -Type DWord",
-            ]
-        )
-        completed = self._runner.run(["powershell", "-NoProfile", "-Command", script])
+        completed = self._runner.run(["powershell", "-NoProfile", "-Command", _SPEECH_PREF_SCRIPT])
         detail = self._format_command_detail(completed)
         if completed.returncode != 0:
             return f"speech preferences: {detail}"
@@ -823,7 +1110,7 @@ class SystemConfigService:
             DiagnosticStepResult(
                 name="Diagnostic Short Date",
                 success=True,
-                detail=str(self._registry.get_value(r"HKCU:\Control Panel\International", "sShortDate") or "Not Set"),
+                detail=str(self._registry.get_value(INTL_REG_PATH, "sShortDate") or "Not Set"),
             )
         )
         spelling_ok, spelling_actual = self._read_arabic_spelling_state()
@@ -837,16 +1124,16 @@ class SystemConfigService:
         return diagnostics
 
     def _set_desktop_icon_registry_values(self, map_path: Callable[[str], str]) -> None:
+        items = tuple((guid, 0) for guid in DESKTOP_ICON_GUIDS)
         for icon_path in DESKTOP_ICON_VISIBILITY_PATHS:
-            target = map_path(icon_path)
-            for guid in DESKTOP_ICON_GUIDS:
-                self._registry.set_value(target, guid, 0)
+            self._registry.set_values(map_path(icon_path), items)
 
     def _check_desktop_icon_registry_values(self, root: str) -> bool:
         for icon_path in DESKTOP_ICON_VISIBILITY_PATHS:
             path = self._map_user_path(icon_path, root)
+            values = self._registry.get_values(path, DESKTOP_ICON_GUIDS)
             for guid in DESKTOP_ICON_GUIDS:
-                value = self._registry.get_value(path, guid)
+                value = values.get(guid)
                 if value is None:
                     return False
                 try:
@@ -866,47 +1153,39 @@ class SystemConfigService:
         completed = self._runner.run(command)
         return self._format_command_detail(completed)
 
+    # The service treats its FixedSystemConfig as immutable, so these
+    # config-derived values are computed once per instance.
+    @functools.cached_property
     def _primary_ui_language(self) -> str:
-        languages = tuple(lang for lang in self._config.locale.ui_languages if lang)
-        if languages:
-            return languages[0]
-        return self._config.locale.system_locale
+        languages = self._target_language_order
+        return languages[0]
 
+    @functools.cached_property
     def _target_language_order(self) -> tuple[str, ...]:
         languages = tuple(lang for lang in self._config.locale.ui_languages if lang)
         if languages:
             return languages
         return (self._config.locale.system_locale,)
 
-    def _current_language_order(self) -> list[str]:
-        language_list_raw = self._run_and_capture(
-            [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                "(Get-WinUserLanguageList).LanguageTag",
-            ]
-        )
-        return [line.strip() for line in language_list_raw.splitlines() if line.strip()]
+    def _run_locale_queries(self) -> dict[str, str]:
+        return self._run_cache.get("locale_queries", lambda: self._run_powershell_batch(LOCALE_QUERY_BLOCKS))
 
+    def _run_powershell_batch(self, blocks: Sequence[tuple[str, str]]) -> dict[str, str]:
+        script = _build_powershell_batch_script(blocks)
+        completed = self._runner.run(["powershell", "-NoProfile", "-Command", script])
+        return _parse_powershell_batch_output(completed.stdout or "")
+
+    @functools.cached_property
     def _default_apps_xml_path(self) -> Path:
         if winreg is None:
             return Path(tempfile.gettempdir()) / "AIO_DefaultAppAssociations.xml"
         return Path(DEFAULT_APPS_XML_PATH_WINDOWS)
 
-    def _write_default_apps_association_file(self) -> Path:
-        path = self._default_apps_xml_path()
+    def _write_default_apps_association_file(self, path: Path, content: bytes) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        root = ET.Element("DefaultAssociations")
-        for identifier, prog_id, app_name in DEFAULT_APP_ASSOCIATIONS:
-            ET.SubElement(
-                root,
-                "Association",
-                attrib={"Identifier": identifier, "ProgId": prog_id, "ApplicationName": app_name},
-            )
-        tree = ET.ElementTree(root)
-        tree.write(path, encoding="utf-8", xml_declaration=True)
-        return path
+        temp_path = path.with_name(path.name + ".part")
+        temp_path.write_bytes(content)
+        os.replace(temp_path, path)
 
     def _run_and_capture(self, command: Sequence[str]) -> str:
         completed = self._runner.run(command)
@@ -942,3 +1221,97 @@ class SystemConfigService:
 
 def _ps_quote(value: str) -> str:
     return "'" + value.replace("'", "''") + "'"
+
+
+def _build_default_apps_xml() -> bytes:
+    root = ET.Element("DefaultAssociations")
+    for identifier, prog_id, app_name in DEFAULT_APP_ASSOCIATIONS:
+        ET.SubElement(
+            root,
+            "Association",
+            attrib={"Identifier": identifier, "ProgId": prog_id, "ApplicationName": app_name},
+        )
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_power_schemes(output: str) -> tuple[tuple[str, str, bool], ...]:
+    """Parse powercfg output into (guid, name, active) tuples.
+
+    Cached by output string: within one pass the same /list or
+    /getactivescheme text is parsed at most once.
+    """
+    schemes: list[tuple[str, str, bool]] = []
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith(POWERCFG_LINE_PREFIX):
+            continue
+        parsed = _parse_power_scheme_line(line)
+        if parsed is not None:
+            schemes.append(parsed)
+    if not schemes:
+        # Output without the line prefix (e.g. embedded mid-line): keep the
+        # historical whole-string regex as a last resort.
+        match = POWERCFG_GUID_PATTERN.search(output)
+        if match:
+            schemes.append((match.group(1).strip(), match.group(2).strip(), bool(match.group(3))))
+    return tuple(schemes)
+
+
+def _parse_power_scheme_line(line: str) -> tuple[str, str, bool] | None:
+    """Parse one 'Power Scheme GUID: <guid>  (<name>) [*]' line.
+
+    The well-formed case is handled with plain slicing; anything that does not
+    fit that shape falls back to the regex.
+    """
+    rest = line[len(POWERCFG_LINE_PREFIX) :].strip()
+    guid = rest[:36]
+    if _looks_like_guid(guid):
+        tail = rest[36:].strip()
+        active = tail.endswith("*")
+        name = tail.rstrip("* ").strip()
+        if name.startswith("(") and name.endswith(")"):
+            return guid, name[1:-1].strip(), active
+    match = POWERCFG_GUID_PATTERN.search(line)
+    if match:
+        return match.group(1).strip(), match.group(2).strip(), bool(match.group(3))
+    return None
+
+
+def _looks_like_guid(value: str) -> bool:
+    # Same laxity as POWERCFG_GUID_PATTERN (36 hex/dash chars) without the regex round trip.
+    return len(value) == 36 and not value.encode("ascii", "replace").translate(None, _GUID_CHARS)
+
+
+def _split_language_list(raw: str) -> list[str]:
+    return [line.strip() for line in raw.splitlines() if line.strip()]
+
+
+def _batch_sentinel(key: str) -> str:
+    return f"{PS_BATCH_SENTINEL_PREFIX}{key}==="
+
+
+def _build_powershell_batch_script(blocks: Sequence[tuple[str, str]]) -> str:
+    parts: list[str] = []
+    for key, script in blocks:
+        parts.append(f"Write-Output '{_batch_sentinel(key)}'")
+        parts.append(script)
+    return "; ".join(parts)
+
+
+def _parse_powershell_batch_output(output: str) -> dict[str, str]:
+    values: dict[str, str] = {}
+    current: str | None = None
+    collected: list[str] = []
+    for line in output.splitlines():
+        stripped = line.strip()
+        if stripped.startswith(PS_BATCH_SENTINEL_PREFIX) and stripped.endswith("==="):
+            if current is not None:
+                values[current] = "\n".join(collected).strip()
+            current = stripped[len(PS_BATCH_SENTINEL_PREFIX) : -3]
+            collected = []
+        elif current is not None:
+            collected.append(line)
+    if current is not None:
+        values[current] = "\n".join(collected).strip()
+    return values
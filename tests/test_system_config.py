@@ -14,10 +14,13 @@ from services.system_config import (
     DESKTOP_ICON_VISIBILITY_PATHS,
     DESKTOP_POLICY_PATH,
     DESKTOP_POLICY_VALUE,
+    LOCALE_QUERY_BLOCKS,
     TARGET_HOME_GEO_ID,
     ConfigCheckResult,
     RegistryAccessor,
     SystemConfigService,
+    _batch_sentinel,
+    _build_powershell_batch_script,
 )
 
 
@@ -43,10 +46,32 @@ class FakeRegistry(RegistryAccessor):
         self.values[(path, value_name)] = value
 
 
+def _locale_batch_stdout() -> str:
+    config = IMMUTABLE_CONFIG.system
+    values = {
+        "locale": config.locale.system_locale,
+        "culture": config.locale.ui_languages[0],
+        "geo": str(TARGET_HOME_GEO_ID),
+        "langs": "en-US\nar-SA",
+        "display": config.locale.ui_languages[0],
+    }
+    lines: list[str] = []
+    for key, value in values.items():
+        lines.append(_batch_sentinel(key))
+        lines.append(value)
+    return "\n".join(lines) + "\n"
+
+
 def _desired_state_runner() -> FakeRunner:
     config = IMMUTABLE_CONFIG.system
     return FakeRunner(
         {
+            (
+                "powershell",
+                "-NoProfile",
+                "-Command",
+                _build_powershell_batch_script(LOCALE_QUERY_BLOCKS),
+            ): _locale_batch_stdout(),
             ("tzutil", "/g"): f"{config.timezone}\n",
             ("powercfg", "/getactivescheme"): "Power Scheme GUID: 8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c  (High performance)",
             (
@@ -118,7 +143,7 @@ def test_check_reports_desired_state() -> None:
     registry.set_value(
         DEFAULT_APPS_POLICY_PATH,
         DEFAULT_APPS_POLICY_VALUE,
-        str(service._default_apps_xml_path()),
+        str(service._default_apps_xml_path),
     )
     results = service.check()
     assert all(isinstance(res, ConfigCheckResult) and res.in_desired_state for res in results)
@@ -136,13 +161,10 @@ def test_apply_runs_commands_and_sets_registry() -> None:
         ("powercfg", "/setactive", config.power_plan.scheme) in runner.commands
         or ("powercfg", "/setactive", "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c") in runner.commands
     )
-    locale_cmd = (
-        "powershell",
-        "-NoProfile",
-        "-Command",
-        f"Set-WinSystemLocale -SystemLocale {config.locale.system_locale}",
+    assert any(
+        cmd[0] == "powershell" and f"Set-WinSystemLocale -SystemLocale {config.locale.system_locale}" in cmd[-1]
+        for cmd in runner.commands
     )
-    assert locale_cmd in runner.commands
     assert any(cmd[0] == "dism" and "/Import-DefaultAppAssociations:" in cmd[2] for cmd in runner.commands if len(cmd) >= 3)
     assert ("reg", "load", fr"HKU\{DEFAULT_USER_HIVE_KEY}", r"C:\Users\Default\NTUSER.DAT") in runner.commands
     assert ("reg", "unload", fr"HKU\{DEFAULT_USER_HIVE_KEY}") in runner.commands
@@ -179,7 +201,7 @@ def test_apply_runs_commands_and_sets_registry() -> None:
         for guid in DESKTOP_ICON_GUIDS:
             assert registry.get_value(mapped_current, guid) == 0
             assert registry.get_value(mapped_default, guid) == 0
-    assert registry.get_value(DEFAULT_APPS_POLICY_PATH, DEFAULT_APPS_POLICY_VALUE) == str(service._default_apps_xml_path())
+    assert registry.get_value(DEFAULT_APPS_POLICY_PATH, DEFAULT_APPS_POLICY_VALUE) == str(service._default_apps_xml_path)
 
 
 def test_apply_selected_only_runs_requested_steps() -> None: